@@ -0,0 +1,342 @@
+"""Benchmark hors ligne de rss_processor.py.
+
+Des serveurs HTTP locaux remplacent les flux RSS, les pages d'articles et les
+services de traduction (MyMemory, LibreTranslate). Le script pilote
+ensuite RSSProcessor.process_opml et mesure le débit et la latence de chaque étape,
+ainsi que la mémoire maximale du processus.
+
+    python benchmarks/run_benchmark.py --scenario small
+    python benchmarks/run_benchmark.py --scenario medium --output bench.json
+    python benchmarks/run_benchmark.py --scenario medium --baseline bench.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import rss_processor as rp
+
+# Nombre d'articles par flux, de paragraphes par article, latence et taux d'erreur
+# des services simulés (secondes, proportion de réponses 503)
+SCENARIOS = {
+    'small': {'articles_per_feed': 1, 'paragraphs': 3, 'feed_latency': 0.02,
+              'page_latency': 0.05, 'translation_latency': 0.05, 'error_rate': 0.0},
+    'medium': {'articles_per_feed': 3, 'paragraphs': 6, 'feed_latency': 0.05,
+               'page_latency': 0.1, 'translation_latency': 0.1, 'error_rate': 0.05},
+    'large': {'articles_per_feed': 10, 'paragraphs': 12, 'feed_latency': 0.1,
+              'page_latency': 0.2, 'translation_latency': 0.2, 'error_rate': 0.1},
+}
+
+# Étapes rapportées, dans l'ordre du traitement (spans enregistrés par rp.METRICS)
+STAGES = ['fetch', 'extract', 'analyze', 'dedup', 'translate', 'summarize', 'assemble', 'document']
+
+WORDS = (
+    "audit finance bank market regulator company report growth risk control data "
+    "cloud security investor revenue quarter forecast inflation policy board "
+    "accounting standard compliance technology model analysis results"
+).split()
+
+
+def sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 18))]
+    return " ".join(words).capitalize() + "."
+
+
+def paragraph(rng: random.Random) -> str:
+    return " ".join(sentence(rng) for _ in range(rng.randint(3, 6)))
+
+
+# --- Serveur de substitution ---
+class StandInHandler(BaseHTTPRequestHandler):
+    server_version = "RSSBenchmark/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def scenario(self) -> Dict:
+        return self.server.scenario
+
+    def _delay(self, key: str) -> bool:
+        time.sleep(self.scenario[key])
+        if self.server.rng_random() < self.scenario['error_rate']:
+            self._send(503, "text/plain", b"indisponible")
+            return False
+        return True
+
+    def _send(self, status: int, content_type: str, body: bytes, headers: Dict[str, str] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, payload):
+        self._send(200, "application/json", json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = url.path.strip('/').split('/')
+        if parts[0] == 'feeds':
+            self._serve_feed(parts[1], int(parts[2].split('.')[0]))
+        elif parts[0] == 'articles':
+            self._serve_article(parts[1], int(parts[2]), int(parts[3].split('.')[0]))
+        elif parts[0] == 'mymemory':
+            if self._delay('translation_latency'):
+                # Segments regroupés un par ligne : chaque ligne est traduite séparément
+                lines = parse_qs(url.query).get('q', [''])[0].split("\n")
+                translated = "\n".join(f"[fr] {line}" for line in lines)
+                self._send_json({'responseStatus': 200, 'responseData': {'translatedText': translated}})
+        else:
+            self._send(404, "text/plain", b"introuvable")
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length).decode('utf-8')
+        url = urlparse(self.path)
+        if url.path.startswith('/libre'):
+            if self._delay('translation_latency'):
+                if self.headers.get('Content-Type', '').startswith('application/json'):
+                    texts = json.loads(body).get('q', '')
+                else:
+                    texts = parse_qs(body).get('q', [''])[0]
+                if isinstance(texts, list):
+                    self._send_json({'translatedText': [f"[fr] {text}" for text in texts]})
+                else:
+                    self._send_json({'translatedText': f"[fr] {texts}"})
+        else:
+            self._send(404, "text/plain", b"introuvable")
+
+    def _serve_feed(self, category: str, feed_index: int):
+        etag = f'"{category}-{feed_index}-{self.server.feed_version}"'
+        if self.headers.get('If-None-Match') == etag:
+            self._send(304, "application/rss+xml", b"")
+            return
+        if not self._delay('feed_latency'):
+            return
+        rng = random.Random(f"{category}/{feed_index}")
+        base = self.server.base_url
+        items = []
+        for i in range(self.scenario['articles_per_feed']):
+            published = formatdate(time.time() - (feed_index * 7 + i) * 3600, usegmt=True)
+            items.append(
+                f"<item><title>{sentence(rng)}</title>"
+                f"<link>{base}/articles/{category}/{feed_index}/{i}.html</link>"
+                f"<guid>{category}-{feed_index}-{i}</guid>"
+                f"<pubDate>{published}</pubDate>"
+                f"<description>{sentence(rng)}</description></item>"
+            )
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>Flux {category} {feed_index}</title><link>{base}</link>"
+            f"{''.join(items)}</channel></rss>"
+        ).encode('utf-8')
+        self._send(200, "application/rss+xml; charset=utf-8", body, {'ETag': etag})
+
+    def _serve_article(self, category: str, feed_index: int, article_index: int):
+        if not self._delay('page_latency'):
+            return
+        rng = random.Random(f"{category}/{feed_index}/{article_index}")
+        paragraphs = "".join(f"<p>{paragraph(rng)}</p>" for _ in range(self.scenario['paragraphs']))
+        body = (
+            f"<html><head><title>{sentence(rng)}</title></head><body>"
+            f"<article><h1>{sentence(rng)}</h1>{paragraphs}</article></body></html>"
+        ).encode('utf-8')
+        self._send(200, "text/html; charset=utf-8", body)
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, scenario: Dict, seed: int = 0):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.scenario = scenario
+        self.feed_version = 0
+        self.base_url = f"http://127.0.0.1:{self.server_address[1]}"
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    def rng_random(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+def write_opml(source_opml: Path, target_opml: Path, base_url: str) -> int:
+    """Recopie la structure de feedly.opml en pointant chaque flux vers le serveur local"""
+    tree = ET.parse(source_opml)
+    feed_count = 0
+    for category in tree.getroot().findall('body/outline'):
+        category_slug = category.get('text', 'categorie').replace(' ', '_')
+        for index, feed in enumerate(category.findall('outline')):
+            feed.set('xmlUrl', f"{base_url}/feeds/{category_slug}/{index}.xml")
+            feed_count += 1
+    tree.write(target_opml, encoding='utf-8', xml_declaration=True)
+    return feed_count
+
+
+# --- Mesures ---
+def stage_report(metrics_report: Dict, wall_seconds: float) -> Dict[str, Dict]:
+    empty = {'count': 0, 'total_seconds': 0.0, 'p50': 0.0, 'p95': 0.0}
+    report = {}
+    for stage in STAGES:
+        stats = metrics_report['stages'].get(stage, empty)
+        report[stage] = {
+            'count': stats['count'],
+            'total_seconds': stats['total_seconds'],
+            'throughput_per_s': stats['count'] / wall_seconds if wall_seconds else 0.0,
+            'p50': stats['p50'],
+            'p95': stats['p95'],
+        }
+    return report
+
+
+class PeakRSSSampler:
+    """Mémoire résidente maximale, échantillonnée pendant l'exécution"""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak_mb = rp.current_rss_mb() or 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, rp.current_rss_mb() or 0.0)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, rp.current_rss_mb() or 0.0)
+
+
+def run_scenario(name: str, args: argparse.Namespace) -> Dict:
+    scenario = SCENARIOS[name]
+    rp.Config.MAX_ARTICLES_PER_FEED = scenario['articles_per_feed']
+    rp.Config.LOCAL_TRANSLATION = not args.no_local_translation
+    # Le cache de pages est désactivé pour mesurer l'extraction à chaque passage
+    rp.Config.ARTICLE_CACHE_FRESH_HOURS = 0
+    with tempfile.TemporaryDirectory(prefix="rss_bench_") as workdir, StandInServer(scenario, args.seed) as server:
+        rp.Config.MYMEMORY_URL = f"{server.base_url}/mymemory/get"
+        rp.Config.LIBRETRANSLATE_URL = f"{server.base_url}/libre/translate"
+        opml_file = Path(workdir) / "bench.opml"
+        feed_count = write_opml(Path(args.opml), opml_file, server.base_url)
+        previous_cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            # Chaque passage retraite les mêmes articles : ni articles déjà couverts écartés,
+            # ni résultats conservés réutilisés, seules les reprises internes sont regroupées
+            processor = rp.RSSProcessor(args.summary_profile, inference_processes=args.inference_processes,
+                                        skip_seen=False, reuse_results=False)
+            processor.translator.translator = False  # googletrans n'a pas de substitut local
+            runs = []
+            for run_index in range(args.runs):
+                with PeakRSSSampler() as sampler:
+                    start = time.perf_counter()
+                    processor.process_opml(str(opml_file), pipelined=args.pipeline)
+                    wall_seconds = time.perf_counter() - start
+                metrics_report = rp.METRICS.report()
+                runs.append({
+                    'run': run_index + 1,
+                    'wall_seconds': wall_seconds,
+                    'peak_rss_mb': sampler.peak_mb,
+                    'stages': stage_report(metrics_report, wall_seconds),
+                    'counters': metrics_report['counters'],
+                })
+            processor.close()
+        finally:
+            os.chdir(previous_cwd)
+    return {'scenario': name, 'feeds': feed_count, 'settings': scenario, 'runs': runs}
+
+
+def print_report(report: Dict):
+    print(f"\nScénario {report['scenario']} ({report['feeds']} flux)")
+    for run in report['runs']:
+        print(f"  Passage {run['run']} : {run['wall_seconds']:.2f} s, RSS max {run['peak_rss_mb']:.0f} Mo")
+        print(f"    {'étape':<11}{'nb':>6}{'total(s)':>10}{'débit/s':>9}{'p50(s)':>9}{'p95(s)':>9}")
+        for stage, stats in run['stages'].items():
+            print(f"    {stage:<11}{stats['count']:>6}{stats['total_seconds']:>10.2f}"
+                  f"{stats['throughput_per_s']:>9.2f}{stats['p50']:>9.3f}{stats['p95']:>9.3f}")
+
+
+def compare_with_baseline(reports: List[Dict], baseline_file: str, tolerance: float) -> List[str]:
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = {report['scenario']: report for report in json.load(f)}
+    regressions = []
+    for report in reports:
+        reference = baseline.get(report['scenario'])
+        if not reference:
+            continue
+        for run, reference_run in zip(report['runs'], reference['runs']):
+            limit = reference_run['wall_seconds'] * (1 + tolerance)
+            if run['wall_seconds'] > limit:
+                regressions.append(
+                    f"{report['scenario']} passage {run['run']} : {run['wall_seconds']:.2f} s "
+                    f"(référence {reference_run['wall_seconds']:.2f} s)"
+                )
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark hors ligne de rss_processor.py")
+    parser.add_argument('--scenario', nargs='+', default=['small'], choices=list(SCENARIOS))
+    parser.add_argument('--opml', default=str(ROOT / "feedly.opml"),
+                        help="OPML dont la structure (catégories, flux) est reproduite")
+    parser.add_argument('--runs', type=int, default=2,
+                        help="Passages successifs (le second profite des caches et des 304)")
+    parser.add_argument('--pipeline', action='store_true', help="Utilise le pipeline asynchrone")
+    parser.add_argument('--summary-profile', default=rp.Config.DEFAULT_SUMMARY_PROFILE,
+                        choices=list(rp.Config.SUMMARY_PROFILES))
+    parser.add_argument('--inference-processes', type=int, default=0)
+    parser.add_argument('--no-local-translation', action='store_true',
+                        help="Force le passage par les services de traduction simulés")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Rapport JSON à écrire")
+    parser.add_argument('--baseline', help="Rapport JSON de référence")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Ralentissement toléré par rapport à la référence (0.2 = 20 %%)")
+    args = parser.parse_args(argv)
+
+    reports = [run_scenario(name, args) for name in args.scenario]
+    for report in reports:
+        print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        regressions = compare_with_baseline(reports, args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Régression : {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,39 +1,37 @@
 import os
 import re
+import sys
+import argparse
 import xml.etree.ElementTree as ET
-import feedparser
-from transformers import BartTokenizer, BartForConditionalGeneration
-try:
-    from transformers import MarianMTModel, MarianTokenizer, pipeline
-    HF_AVAILABLE = True
-except ImportError:
-    HF_AVAILABLE = False
-    
-try:
-    from googletrans import Translator
-except ImportError:
-    Translator = None
-
-from langdetect import detect, DetectorFactory
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from docx import Document
-from docx.shared import Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from tqdm import tqdm
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, Future, TimeoutError as FuturesTimeoutError
 import logging
-import newspaper
+import queue
+import threading
 import time
 import json
+import hashlib
+import sqlite3
+import zlib
+from contextlib import contextmanager
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple, Union
 import dateutil.parser
+import asyncio
+import gc
+import heapq
+import html
+import multiprocessing
+from collections import Counter
+from itertools import islice
 
-from tkinter import Tk, messagebox
-from tkinter.filedialog import askopenfilename
+# Les dépendances lourdes (transformers, newspaper, docx, feedparser, langdetect,
+# tkinter) sont importées à la première utilisation, pas au chargement du module
 
 # Configuration des logs
 logging.basicConfig(
@@ -47,7 +45,28 @@ logging.basicConfig(
 logging.getLogger("transformers.modeling_utils").setLevel(logging.ERROR)
 logging.getLogger("urllib3.connectionpool").setLevel(logging.WARNING)
 
-DetectorFactory.seed = 0
+_langdetect_lock = threading.Lock()
+_langdetect = None
+
+def detect_language(text: str) -> str:
+    """langdetect chargé à la demande, avec une graine fixe pour des résultats stables"""
+    global _langdetect
+    if _langdetect is None:
+        with _langdetect_lock:
+            if _langdetect is None:
+                from langdetect import detect, DetectorFactory
+                DetectorFactory.seed = 0
+                _langdetect = detect
+    with METRICS.span('langdetect'):
+        # Un extrait suffit : le coût de langdetect croît avec la longueur du texte
+        return _langdetect(text[:Config.LANGDETECT_SAMPLE_CHARS])
+
+def load_translation_pipeline():
+    try:
+        from transformers import pipeline
+        return pipeline
+    except ImportError:
+        return None
 
 # --- Classe Config ---
 class Config:
@@ -56,37 +75,1372 @@ class Config:
     MAX_WORKERS = 3  # Réduit pour éviter les rate limits
     REQUEST_TIMEOUT = 10
     RETRY_COUNT = 2
-    CACHE_FILE = "translation_cache.json"
+    CACHE_FILE = "translation_cache.sqlite3"
+    CACHE_MAX_ENTRIES = 200000  # Au-delà, les traductions les moins utilisées sont évincées
+    CACHE_MAX_AGE_DAYS = 180
+    CACHE_EVICTION_INTERVAL = 500  # Écritures entre deux passes d'éviction
+    FEED_STATE_FILE = "feed_state.sqlite3"
+    # Flux lus au fil de l'eau : la lecture s'arrête après MAX_ARTICLES_PER_FEED entrées,
+    # feedparser ne sert plus que pour les flux malformés
+    FEED_STREAMING = True
+    FEED_CHUNK_SIZE = 16384
+    HTTP_POOL_SIZE = 10  # Connexions conservées par hôte
+    HTTP_POOL_HOSTS = 32  # Hôtes dont les connexions sont conservées
+    USER_AGENT = "Mozilla/5.0 (compatible; RSSProcessor/1.0)"
+    MAX_CONNECTIONS_PER_HOST = 2  # Téléchargements simultanés sur un même site
+    HOST_MIN_INTERVAL = 0.5  # Secondes entre deux requêtes vers un même site
+    ARTICLE_CACHE_FILE = "article_cache.sqlite3"
+    ARTICLE_CACHE_FRESH_HOURS = 24  # En deçà, une page en cache n'est pas revalidée
+    PIPELINE_MODE = False  # Toutes les catégories traversent ensemble le pipeline asynchrone
+    PIPELINE_QUEUE_SIZE = 32  # Capacité des files entre deux étapes
+    PIPELINE_IO_WORKERS = 8  # Téléchargements et traductions simultanés
+    # Échéances : budgets par exécution, catégorie et article, résumé dégradé quand le temps manque
+    RUN_BUDGET = None  # Secondes allouées à une exécution (None : pas d'échéance)
+    ARTICLE_BUDGET = 180  # Secondes au plus pour traiter un article
+    DOCUMENT_RESERVE = 30  # Secondes gardées sur le budget pour écrire les documents
+    DEADLINE_GRACE = 5  # Secondes laissées aux articles en cours quand une catégorie expire
+    # Part du budget restante sous laquelle on passe à l'étape suivante :
+    # moins de faisceaux, profil moins coûteux, puis simple troncature
+    DEGRADATION_THRESHOLDS = (0.5, 0.25, 0.1)
+    DEGRADED_NUM_BEAMS = 2
+    DEGRADED_SUMMARY_PROFILE = 'extractive'
+    OUTPUT_FORMATS = ['docx']  # Formats écrits pour chaque catégorie : docx, html, md, jsonl
+    RENDER_WORKERS = 4  # Documents écrits simultanément (catégories x formats)
+    MAX_ARTICLES_PER_DIGEST = None  # Articles les plus récents retenus par revue (None : tous)
+    SPOOL_DIR = "spool"  # Répertoire des travaux soumis au mode démon
+    DAEMON_POLL_INTERVAL = 5  # Secondes entre deux scrutations du répertoire
+    INFERENCE_PROCESSES = 0  # 0 : inférence dans des threads du processus principal
+    INFERENCE_THREADS_PER_PROCESS = None  # None : cœurs disponibles / nombre de processus
+    PRELOAD_TRANSLATION_LANGS = ['en']  # Modèles Marian chargés avant le fork des workers
+    INFERENCE_TASK_TIMEOUT = 600  # Secondes d'attente maximale d'un lot confié à un processus d'inférence
+    INFERENCE_POLL_INTERVAL = 1.0  # Secondes entre deux vérifications de la vie des processus d'inférence
+    METRICS_PREFIX = "rss_processor"  # Préfixe des métriques Prometheus
     MAX_CONTENT_LENGTH = 1000  # Caractères max pour le résumé
     MIN_SUMMARY_LENGTH = 50
     MAX_SUMMARY_LENGTH = 300
+    SUMMARY_BATCH_SIZE = 8  # Articles résumés ensemble par appel à generate
+    SUMMARY_BUCKET_TOKENS = 128  # Largeur des tranches de longueur : un lot ne mêle pas les tranches
+    # Profils de résumé : compromis vitesse / qualité sélectionnables sans modifier le code
+    SUMMARY_PROFILES = {
+        'quality': {'model': "facebook/bart-large-cnn", 'num_beams': 4, 'quantize': False},
+        'quantized': {'model': "facebook/bart-large-cnn", 'num_beams': 4, 'quantize': True},
+        'distilled': {'model': "sshleifer/distilbart-cnn-12-6", 'num_beams': 4, 'quantize': False},
+        'greedy': {'model': "facebook/bart-large-cnn", 'num_beams': 1, 'quantize': False},
+        # Phrases extraites par TextRank sur TF-IDF : quelques millisecondes, toutes langues
+        'extractive': {'engine': 'extractive', 'sentences': 3, 'max_chars': 600},
+    }
+    DEFAULT_SUMMARY_PROFILE = 'quality'
+    CATEGORY_SUMMARY_PROFILES = {}  # Ex. : {'Tech': 'distilled'}
+    # Brèves : sous SHORT_ARTICLE_CHARS caractères, profil SHORT_ARTICLE_PROFILE
+    # sauf profil de catégorie (None : profil par défaut pour tous les articles)
+    SHORT_ARTICLE_PROFILE = 'extractive'
+    SHORT_ARTICLE_CHARS = 1200
+    EXTRACTIVE_MAX_INPUT_CHARS = 20000  # Le résumé extractif voit tout l'article, pas seulement le début
+    TEXTRANK_DAMPING = 0.85
+    TEXTRANK_ITERATIONS = 50
+    SUMMARY_BENCHMARK_FILE = "benchmarks/summarizer_articles.json"
+    # Langues résumées avant traduction (celles des modèles de résumé) : seuls
+    # le titre et le résumé sont alors traduits, pas le texte complet
+    SUMMARIZE_FIRST = True
+    SUMMARIZE_FIRST_LANGUAGES = ['en']
+    BATCH_WAIT_TIMEOUT = 0.05  # Secondes d'attente pour compléter un lot
+    BATCH_LOOKAHEAD = 4  # Lots en attente examinés pour regrouper les requêtes d'une même tranche
+    LANGDETECT_SAMPLE_CHARS = 500  # Caractères examinés pour détecter la langue
+    TRANSLATION_SEGMENT_CHARS = 400  # Taille max d'un segment envoyé à MarianMT
+    TRANSLATION_BATCH_SIZE = 16  # Segments traduits ensemble par le pipeline local
+    LOCAL_TRANSLATION = True  # False : services externes uniquement
+    MYMEMORY_URL = "https://api.mymemory.translated.net/get"
+    LIBRETRANSLATE_URL = "https://libretranslate.de/translate"
+    # Routage des services de traduction : débit (requêtes/s, rafale), disjoncteur, moyennes mobiles
+    PROVIDER_RATE_LIMITS = {'mymemory': (2.0, 4), 'libretranslate': (2.0, 4), 'googletrans': (0.5, 1)}
+    # Caractères par segment et par requête (plusieurs segments regroupés) pour chaque service
+    PROVIDER_SEGMENT_CHARS = {'mymemory': 450, 'libretranslate': 1000, 'googletrans': 4500}
+    PROVIDER_REQUEST_CHARS = {'mymemory': 450, 'libretranslate': 4000, 'googletrans': 4500}
+    REMOTE_TRANSLATION_BATCH_SIZE = 32  # Textes regroupés pour les services externes
+    REMOTE_TRANSLATION_WORKERS = 4  # Lots envoyés simultanément aux services externes
+    PROVIDER_MAX_WAIT = 2.0  # Au-delà, le service saturé est sauté au profit du suivant
+    PROVIDER_RETRY_COUNT = 1  # Nouvelles tentatives HTTP : le routeur se charge du repli
+    CIRCUIT_FAILURE_THRESHOLD = 3  # Échecs consécutifs avant de suspendre un service
+    CIRCUIT_COOLDOWN = 120  # Secondes de suspension avant un nouvel essai
+    PROVIDER_EWMA_ALPHA = 0.2  # Poids de la dernière mesure de latence et de succès
+    PROVIDER_INITIAL_LATENCY = 1.0
+    # Détection des reprises d'une même dépêche (URL canonique + SimHash du texte)
+    DEDUP_ENABLED = True
+    STORY_INDEX_FILE = "story_index.sqlite3"
+    DEDUP_MAX_HAMMING = 6  # Bits d'écart tolérés entre deux empreintes de 64 bits
+    DEDUP_MIN_CHARS = 200  # En deçà, seule l'URL canonique est comparée
+    DEDUP_SKIP_SEEN = True  # Écarte les articles déjà couverts par une revue précédente
+    STORY_INDEX_MAX_AGE_DAYS = 30
+    # Articles traités conservés pour reprendre une exécution interrompue et reconstruire les revues
+    RESULT_STORE_FILE = "article_results.sqlite3"
+    RESULT_STORE_MAX_AGE_DAYS = 90
+    REUSE_RESULTS = True  # Un article inchangé déjà traité n'est ni retraduit ni résumé à nouveau
+    INCREMENTAL = False  # Seuls les articles absents du stockage sont traités et publiés
+
+# Découpage en phrases : ponctuation finale suivie d'un espace, ou ponctuation chinoise et japonaise,
+# qui n'en est pas suivie
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?…])\s+|(?<=[。！？])\s*')
+
+# Nettoyage du texte : balises HTML résiduelles et espaces multiples
+HTML_TAG_RE = re.compile(r'<.*?>')
+WHITESPACE_RE = re.compile(r'\s+')
+# Estimation du nombre de tokens : mots et signes de ponctuation
+TOKEN_RE = re.compile(r'\w+|[^\w\s]')
+
+def normalize_text(text: str) -> str:
+    return WHITESPACE_RE.sub(' ', HTML_TAG_RE.sub('', text)).strip()
+
+# Paramètres de suivi retirés des URL avant comparaison
+TRACKING_PARAM_RE = re.compile(r'^(utm_\w+|fbclid|gclid|mc_[ce]id|xtor|cmpid|at_\w+|ref|ref_src|icid|ocid|rss)$', re.I)
+WORD_RE = re.compile(r'\w+')
+
+def canonicalize_url(url: str) -> str:
+    """URL sans fragment, préfixe www, paramètres de suivi ni barre finale"""
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+                   if not TRACKING_PARAM_RE.match(k))
+    path = parsed.path.rstrip('/') or '/'
+    return urlunparse(('https' if parsed.scheme in ('http', 'https') else parsed.scheme,
+                       host, path, '', urlencode(query), ''))
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """Empreinte SimHash 64 bits sur les triplets de mots du texte"""
+    words = WORD_RE.findall(text.lower())
+    shingles = {' '.join(words[i:i + shingle_size]) for i in range(max(len(words) - shingle_size + 1, 1))}
+    weights = [0] * 64
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+def new_run_id() -> str:
+    return datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+# --- Classe TextAnalysis ---
+class TextAnalysis:
+    """Texte d'un article normalisé une fois, avec sa langue, ses phrases et sa longueur en tokens"""
+    __slots__ = ('text', 'language', 'sentence_starts', 'sentence_ends', 'token_ends')
+
+    def __init__(self, text: str, language: Optional[str] = None):
+        self.text = normalize_text(text or '')
+        self.language = language
+        # Début et fin de chaque phrase dans le texte, et nombre de tokens cumulé à cette fin
+        self.sentence_starts: List[int] = []
+        self.sentence_ends: List[int] = []
+        self.token_ends: List[int] = []
+        start = tokens = 0
+        separators = [match.span() for match in SENTENCE_SPLIT_RE.finditer(self.text)]
+        for end, next_start in separators + [(len(self.text), len(self.text))]:
+            if end > start:
+                tokens += len(TOKEN_RE.findall(self.text, start, end))
+                self.sentence_starts.append(start)
+                self.sentence_ends.append(end)
+                self.token_ends.append(tokens)
+            start = next_start
+
+    @classmethod
+    def of(cls, value: Union[str, "TextAnalysis"]) -> "TextAnalysis":
+        return value if isinstance(value, cls) else cls(value)
+
+    @staticmethod
+    def text_of(value: Union[str, "TextAnalysis"]) -> str:
+        return value.text if isinstance(value, TextAnalysis) else value
+
+    @property
+    def token_count(self) -> int:
+        return self.token_ends[-1] if self.token_ends else 0
+
+    def detect(self) -> Optional[str]:
+        if self.language is None and self.text:
+            try:
+                self.language = detect_language(self.text)
+            except Exception:
+                pass
+        return self.language
+
+    def sentences(self) -> List[str]:
+        return [self.text[start:end] for start, end in zip(self.sentence_starts, self.sentence_ends)]
+
+    def head(self, max_chars: int) -> Tuple[str, int]:
+        """Début du texte coupé à la dernière fin de phrase avant max_chars, et son nombre de tokens"""
+        if len(self.text) <= max_chars:
+            return self.text, self.token_count
+        k = 0
+        while k < len(self.sentence_ends) and self.sentence_ends[k] <= max_chars:
+            k += 1
+        if k:
+            return self.text[:self.sentence_ends[k - 1]], self.token_ends[k - 1]
+        # Première phrase trop longue : coupure sur un espace
+        cut = self.text.rfind(' ', 0, max_chars)
+        head = self.text[:cut if cut > 0 else max_chars]
+        return head, len(TOKEN_RE.findall(head))
+
+def format_date_french(date_str: str) -> str:
+    if not date_str:
+        return ""
+    months_fr = {
+        'January': 'janvier', 'February': 'février', 'March': 'mars', 'April': 'avril',
+        'May': 'mai', 'June': 'juin', 'July': 'juillet', 'August': 'août',
+        'September': 'septembre', 'October': 'octobre', 'November': 'novembre', 'December': 'décembre',
+        'Jan': 'janv.', 'Feb': 'févr.', 'Mar': 'mars', 'Apr': 'avr.',
+        'May': 'mai', 'Jun': 'juin', 'Jul': 'juill.', 'Aug': 'août',
+        'Sep': 'sept.', 'Oct': 'oct.', 'Nov': 'nov.', 'Dec': 'déc.',
+        'Monday': 'lundi', 'Tuesday': 'mardi', 'Wednesday': 'mercredi', 'Thursday': 'jeudi',
+        'Friday': 'vendredi', 'Saturday': 'samedi', 'Sunday': 'dimanche',
+        'Mon': 'lun', 'Tue': 'mar', 'Wed': 'mer', 'Thu': 'jeu',
+        'Fri': 'ven', 'Sat': 'sam', 'Sun': 'dim'
+    }
+    try:
+        parsed_date = dateutil.parser.parse(date_str)
+        french_date = parsed_date.strftime("%d %B %Y à %H:%M")
+        for eng, fr in months_fr.items():
+            french_date = french_date.replace(eng, fr)
+        return french_date
+    except:
+        french_date = date_str
+        for eng, fr in months_fr.items():
+            french_date = french_date.replace(eng, fr)
+        return french_date
+
+def parse_timestamp(date_str: str) -> Optional[float]:
+    """Date d'un flux en timestamp POSIX (UTC si le fuseau manque), None si elle est illisible"""
+    if not date_str:
+        return None
+    try:
+        parsed = dateutil.parser.parse(date_str)
+    except (ValueError, OverflowError, TypeError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+# --- Classe RunMetrics ---
+class RunMetrics:
+    """Durées par étape et par article, et compteurs d'événements d'une exécution"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self.spans = []
+            self.counters = Counter()
+
+    @contextmanager
+    def span(self, stage: str, **attrs):
+        # Le dictionnaire produit permet à l'appelant de compléter le span (ex. outcome)
+        record = dict(attrs, stage=stage, outcome='ok')
+        start = time.perf_counter()
+        try:
+            yield record
+        except Exception:
+            record['outcome'] = 'error'
+            raise
+        finally:
+            record['duration'] = time.perf_counter() - start
+            with self._lock:
+                self.spans.append(record)
+
+    def increment(self, name: str, amount: int = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] += amount
+
+    def drain(self) -> Tuple[List[Dict], Counter]:
+        # Côté processus d'inférence : mesures de la tâche, renvoyées au parent avec son résultat
+        with self._lock:
+            spans, counters = self.spans, self.counters
+            self.spans, self.counters = [], Counter()
+        return spans, counters
+
+    def merge(self, spans: List[Dict], counters: Counter):
+        with self._lock:
+            self.spans.extend(spans)
+            self.counters.update(counters)
+
+    def report(self) -> Dict:
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        stages = {}
+        articles = {}
+        for span in spans:
+            stages.setdefault(span['stage'], []).append(span)
+            if span.get('article'):
+                article_stages = articles.setdefault(span['article'], {})
+                article_stages[span['stage']] = article_stages.get(span['stage'], 0.0) + span['duration']
+        return {
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(),
+            'wall_seconds': time.time() - self.started_at,
+            'stages': {
+                stage: {
+                    'count': len(stage_spans),
+                    'errors': sum(1 for span in stage_spans if span['outcome'] == 'error'),
+                    'total_seconds': sum(span['duration'] for span in stage_spans),
+                    'p50': percentile([span['duration'] for span in stage_spans], 50),
+                    'p95': percentile([span['duration'] for span in stage_spans], 95),
+                    'max': max(span['duration'] for span in stage_spans),
+                }
+                for stage, stage_spans in sorted(stages.items())
+            },
+            'counters': [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(counters.items())
+            ],
+            'articles': articles,
+        }
+
+    def write_json(self, path: str):
+        self._write_atomic(path, json.dumps(self.report(), ensure_ascii=False, indent=2))
+
+    def write_prometheus(self, path: str):
+        # Format textfile du node_exporter : résumé par étape et compteurs
+        report = self.report()
+        prefix = Config.METRICS_PREFIX
+        lines = [
+            f"# HELP {prefix}_stage_duration_seconds Durée des étapes du traitement",
+            f"# TYPE {prefix}_stage_duration_seconds summary",
+        ]
+        for stage, stats in report['stages'].items():
+            lines.append(f'{prefix}_stage_duration_seconds{{stage="{stage}",quantile="0.5"}} {stats["p50"]:.6f}')
+            lines.append(f'{prefix}_stage_duration_seconds{{stage="{stage}",quantile="0.95"}} {stats["p95"]:.6f}')
+            lines.append(f'{prefix}_stage_duration_seconds_sum{{stage="{stage}"}} {stats["total_seconds"]:.6f}')
+            lines.append(f'{prefix}_stage_duration_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for counter in report['counters']:
+            labels = ",".join(
+                [f'event="{counter["name"]}"'] + [f'{key}="{value}"' for key, value in counter['labels'].items()]
+            )
+            lines.append(f"{prefix}_events_total{{{labels}}} {counter['value']}")
+        lines.append(f"# TYPE {prefix}_run_wall_seconds gauge")
+        lines.append(f"{prefix}_run_wall_seconds {report['wall_seconds']:.3f}")
+        self._write_atomic(path, "\n".join(lines) + "\n")
+
+    @staticmethod
+    def _write_atomic(path: str, content: str):
+        tmp_path = Path(f"{path}.tmp")
+        tmp_path.write_text(content, encoding='utf-8')
+        tmp_path.replace(path)
+
+# Instance partagée par tous les composants, remise à zéro à chaque exécution
+METRICS = RunMetrics()
+
+@contextmanager
+def run_profiler(output_file: Optional[str]):
+    """Profilage optionnel d'une exécution : pyinstrument (échantillonnage) si installé, sinon cProfile"""
+    if not output_file:
+        yield
+        return
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        Profiler = None
+    if Profiler is not None:
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            Path(output_file).write_text(profiler.output_text(unicode=True), encoding='utf-8')
+    else:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(output_file)
+    logging.info(f"Profil d'exécution écrit dans {output_file}")
+
+def create_http_session(retry_count: int = Config.RETRY_COUNT) -> requests.Session:
+    """Session HTTP avec réessais et pool de connexions persistantes"""
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=retry_count,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=Config.HTTP_POOL_HOSTS,
+        pool_maxsize=Config.HTTP_POOL_SIZE
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers['User-Agent'] = Config.USER_AGENT
+    return session
+
+# --- Classe HostThrottle ---
+class HostThrottle:
+    """Limite les requêtes simultanées et leur cadence pour chaque hôte"""
+
+    def __init__(self, max_per_host: int = Config.MAX_CONNECTIONS_PER_HOST,
+                 min_interval: float = Config.HOST_MIN_INTERVAL):
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_allowed = {}
+
+    @contextmanager
+    def slot(self, url: str):
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_allowed.get(host, now))
+                self._next_allowed[host] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+# --- Classe TokenBucket ---
+class TokenBucket:
+    """Seau à jetons partagé entre threads : débit moyen et rafale bornés"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, (1 - self._tokens) / self.rate)
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """Réserve un jeton et renvoie l'attente nécessaire, ou None si elle dépasse max_wait"""
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+# --- Classe ProviderHealth ---
+class ProviderHealth:
+    """Mesures d'un service : latence et taux de succès lissés, état du disjoncteur"""
+
+    def __init__(self, name: str, rate: float, burst: int):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.latency = Config.PROVIDER_INITIAL_LATENCY
+        self.success_rate = 1.0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probing = False
+
+    def expected_cost(self) -> float:
+        # Temps moyen pour obtenir une traduction : attente du débit et latence, divisées par le taux de succès
+        return (self.bucket.wait_time() + self.latency) / max(self.success_rate, 0.05)
+
+# --- Classe ProviderRouter ---
+class ProviderRouter:
+    """Ordonne les services de traduction par coût attendu, avec limitation de débit et disjoncteur"""
+
+    def __init__(self, providers: List[str],
+                 rate_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+                 failure_threshold: int = Config.CIRCUIT_FAILURE_THRESHOLD,
+                 cooldown: float = Config.CIRCUIT_COOLDOWN,
+                 alpha: float = Config.PROVIDER_EWMA_ALPHA,
+                 max_wait: float = Config.PROVIDER_MAX_WAIT):
+        rate_limits = rate_limits if rate_limits is not None else Config.PROVIDER_RATE_LIMITS
+        self.providers = {
+            name: ProviderHealth(name, *rate_limits.get(name, (1.0, 1))) for name in providers
+        }
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.alpha = alpha
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+
+    def ordered(self) -> List[str]:
+        """Services disponibles, du moins coûteux au plus coûteux (ordre de déclaration à égalité)"""
+        now = time.monotonic()
+        with self._lock:
+            available = [
+                health for health in self.providers.values()
+                if health.open_until <= now and not health.probing
+            ]
+        return [health.name for health in sorted(available, key=lambda health: health.expected_cost())]
+
+    def acquire(self, name: str) -> bool:
+        health = self.providers[name]
+        with self._lock:
+            if health.open_until > time.monotonic() or health.probing:
+                return False
+            if health.open_until:
+                # Fin de suspension : un seul appel d'essai à la fois
+                health.probing = True
+        wait = health.bucket.reserve(self.max_wait)
+        if wait is None:
+            with self._lock:
+                health.probing = False
+            METRICS.increment('provider_skipped', provider=name, reason='rate_limit')
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def record(self, name: str, success: bool, latency: float):
+        health = self.providers[name]
+        with self._lock:
+            health.latency += self.alpha * (latency - health.latency)
+            health.success_rate += self.alpha * ((1.0 if success else 0.0) - health.success_rate)
+            health.probing = False
+            if success:
+                health.consecutive_failures = 0
+                health.open_until = 0.0
+                return
+            health.consecutive_failures += 1
+            if health.open_until or health.consecutive_failures >= self.failure_threshold:
+                health.open_until = time.monotonic() + self.cooldown
+                METRICS.increment('circuit_open', provider=name)
+                logging.warning(
+                    f"Service {name} suspendu {self.cooldown:.0f} s après "
+                    f"{health.consecutive_failures} échecs consécutifs"
+                )
+
+    def stats(self) -> Dict[str, Dict]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    'latency': health.latency,
+                    'success_rate': health.success_rate,
+                    'open': health.open_until > now,
+                }
+                for name, health in self.providers.items()
+            }
+
+# --- Classe BatchQueue ---
+class BatchQueue:
+    """File d'inférence unique regroupant les requêtes de plusieurs threads en lots"""
+
+    def __init__(self, batch_fn: Callable[[List], List], max_batch_size: int,
+                 max_wait: float = Config.BATCH_WAIT_TIMEOUT, name: str = "batch-queue",
+                 bucket: Optional[Callable] = None):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.name = name
+        # bucket : clé de regroupement (ex. tranche de longueur) ; un lot ne contient qu'une clé
+        self.bucket = bucket
+        self._queue = queue.Queue()
+        self._backlog = []
+        self._backlog_lock = threading.Lock()
+        self._threads = []
+        self.add_workers(1)
+
+    def add_workers(self, count: int):
+        # Plusieurs consommateurs gardent plusieurs lots en vol (ex. un par processus d'inférence)
+        for _ in range(count):
+            thread = threading.Thread(target=self._run, name=f"{self.name}-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, item) -> Future:
+        future = Future()
+        self._queue.put((item, future, self.bucket(item) if self.bucket else None))
+        return future
+
+    def _collect_batch(self) -> List:
+        if self.bucket is None:
+            return self._drain([self._queue.get()], self.max_batch_size)
+        with self._backlog_lock:
+            # Plusieurs lots d'avance : les requêtes d'une tranche, arrivées à des moments
+            # différents, sont réunies au lieu d'être complétées par des voisines de longueur différente
+            if not self._backlog:
+                self._backlog.append(self._queue.get())
+            self._backlog = self._drain(self._backlog, self.max_batch_size * Config.BATCH_LOOKAHEAD)
+            # La tranche de la plus ancienne requête passe en premier : aucune n'attend indéfiniment
+            key = self._backlog[0][2]
+            batch, rest = [], []
+            for entry in self._backlog:
+                if len(batch) < self.max_batch_size and entry[2] == key:
+                    batch.append(entry)
+                else:
+                    rest.append(entry)
+            self._backlog = rest
+        return batch
+
+    def _drain(self, batch: List, limit: int) -> List:
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < limit:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            items = [item for item, _, _ in batch]
+            try:
+                results = self.batch_fn(items)
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                logging.error(f"Erreur lors du traitement d'un lot de {len(batch)} éléments : {e}")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+
+# --- Classe Deadline ---
+class Deadline:
+    """Budget de temps mesuré sur l'horloge monotone ; sans budget, l'échéance ne tombe jamais"""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.budget = None if seconds is None else max(seconds, 0.0)
+        self.expires_at = None if seconds is None else time.monotonic() + self.budget
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def fraction_left(self) -> float:
+        if self.expires_at is None or not self.budget:
+            return 1.0 if self.expires_at is None else 0.0
+        return self.remaining() / self.budget
+
+    def child(self, seconds: Optional[float]) -> "Deadline":
+        """Sous-budget qui n'excède jamais le temps restant"""
+        remaining = self.remaining()
+        if remaining is None:
+            return Deadline(seconds)
+        return Deadline(remaining if seconds is None else min(seconds, remaining))
+
+def seconds_until(clock_time: str) -> float:
+    """Secondes jusqu'à la prochaine occurrence d'une heure « HH:MM »"""
+    hour, minute = (int(part) for part in clock_time.split(':'))
+    now = datetime.now()
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+# --- Classe DeadlineScheduler ---
+class DeadlineScheduler:
+    """Répartit le budget d'une exécution entre catégories et articles, et choisit le niveau de dégradation"""
+
+    FULL, FEWER_BEAMS, CHEAPER_PROFILE, TRUNCATE = range(4)
+
+    def __init__(self, article_budget: Optional[float] = Config.ARTICLE_BUDGET,
+                 reserve: float = Config.DOCUMENT_RESERVE,
+                 thresholds: Tuple[float, ...] = Config.DEGRADATION_THRESHOLDS):
+        self.article_budget = article_budget
+        self.reserve = reserve
+        self.thresholds = thresholds
+        self.run = Deadline()
+
+    def start_run(self, budget: Optional[float] = Config.RUN_BUDGET) -> Deadline:
+        self.run = Deadline(None if budget is None else budget - self.reserve)
+        if budget is not None:
+            logging.info(f"Budget de l'exécution : {budget:.0f} s (dont {self.reserve:.0f} s pour les documents)")
+        return self.run
+
+    def category_deadline(self, categories_left: int) -> Deadline:
+        # Le temps restant est partagé entre les catégories pas encore traitées
+        remaining = self.run.remaining()
+        return self.run.child(None if remaining is None else remaining / max(categories_left, 1))
+
+    def article_deadline(self, parent: Deadline) -> Deadline:
+        return parent.child(self.article_budget)
+
+    def level(self, deadline: Optional[Deadline]) -> int:
+        if deadline is None:
+            return self.FULL
+        fraction = deadline.fraction_left()
+        return sum(1 for threshold in self.thresholds if fraction < threshold)
+
+# --- Classe SQLiteStore ---
+class SQLiteStore:
+    """Base SQLite partagée entre threads (verrou) et processus (mode WAL)"""
+    SCHEMA = ""
+
+    def __init__(self, db_file: str):
+        self.db_file = Path(db_file)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.db_file),
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None  # autocommit : chaque écriture est incrémentale
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _write(self, sql: str, params: tuple = ()) -> int:
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# --- Classe TranslationCache ---
+class TranslationCache(SQLiteStore):
+    """Cache persistant des traductions, indexé par empreinte du texte complet et paire de langues"""
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS translations (
+            key TEXT PRIMARY KEY,
+            src_lang TEXT NOT NULL,
+            dest_lang TEXT NOT NULL,
+            translation TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            last_access REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_translations_last_access ON translations(last_access);
+    """
+
+    def __init__(self, db_file: str = Config.CACHE_FILE,
+                 max_entries: int = Config.CACHE_MAX_ENTRIES,
+                 max_age_days: float = Config.CACHE_MAX_AGE_DAYS):
+        super().__init__(db_file)
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(text: str, src_lang: str, dest_lang: str) -> str:
+        digest = hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+        return f"{src_lang}:{dest_lang}:{digest}"
+
+    def get(self, text: str, src_lang: str, dest_lang: str = "fr") -> Optional[str]:
+        key = self.make_key(text, src_lang, dest_lang)
+        with self._lock:
+            rows = self._execute("SELECT translation FROM translations WHERE key = ?", (key,))
+            if not rows:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._write("UPDATE translations SET last_access = ? WHERE key = ?", (time.time(), key))
+        return rows[0][0]
+
+    def set(self, text: str, translation: str, src_lang: str, dest_lang: str = "fr"):
+        now = time.time()
+        with self._lock:
+            self._write(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                (self.make_key(text, src_lang, dest_lang), src_lang, dest_lang, translation, now, now)
+            )
+            self.writes += 1
+            due = self.writes % Config.CACHE_EVICTION_INTERVAL == 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        expired = self._write(
+            "DELETE FROM translations WHERE last_access < ?",
+            (time.time() - self.max_age,)
+        )
+        overflow = self._execute("SELECT COUNT(*) FROM translations")[0][0] - self.max_entries
+        if overflow > 0:
+            overflow = self._write(
+                "DELETE FROM translations WHERE key IN "
+                "(SELECT key FROM translations ORDER BY last_access LIMIT ?)",
+                (overflow,)
+            )
+        with self._lock:
+            self.evictions += expired + max(overflow, 0)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'writes': self.writes,
+            'evictions': self.evictions,
+        }
+
+# --- Classe StreamingFeedParser ---
+class StreamingFeedParser:
+    """Analyse incrémentale RSS 2.0, RSS 1.0 et Atom, arrêtée dès que max_entries entrées sont lues"""
+    ROOT_TAGS = {'rss', 'RDF', 'feed'}
+    ENTRY_TAGS = {'item', 'entry'}
+    FEED_TAGS = {'channel', 'feed'}
+    # Espaces de noms dont les éléments sont lus (les autres, ex. media:title, sont ignorés)
+    NAMESPACES = {
+        '',
+        'http://www.w3.org/2005/Atom',
+        'http://purl.org/rss/1.0/',
+        'http://purl.org/dc/elements/1.1/',
+        'http://purl.org/rss/1.0/modules/content/',
+    }
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.parser = ET.XMLPullParser(events=('start', 'end'))
+        self.recognized = False
+        self.title = None
+        self.entries: List[Dict] = []
+        self._path: List[str] = []
+        self._entry = None
+
+    @staticmethod
+    def _split(tag: str) -> Tuple[str, str]:
+        namespace, _, name = tag[1:].rpartition('}') if tag.startswith('{') else ('', '', tag)
+        return namespace, name
+
+    @staticmethod
+    def _text(element) -> str:
+        return ''.join(element.itertext()).strip()
+
+    def feed(self, chunk: bytes) -> bool:
+        """Analyse un morceau du document ; True quand il n'est plus utile de lire la suite"""
+        self.parser.feed(chunk)
+        for event, element in self.parser.read_events():
+            _, name = self._split(element.tag)
+            if event == 'start':
+                if not self._path:
+                    self.recognized = name in self.ROOT_TAGS
+                    if not self.recognized:
+                        return True
+                if self._entry is None and name in self.ENTRY_TAGS:
+                    self._entry = element
+                self._path.append(name)
+                continue
+            self._path.pop()
+            if element is self._entry:
+                entry = self._parse_entry(element)
+                if entry['link']:
+                    self.entries.append(entry)
+                element.clear()
+                self._entry = None
+                if len(self.entries) >= self.max_entries:
+                    return True
+            elif (self._entry is None and name == 'title' and self.title is None
+                  and self._path and self._path[-1] in self.FEED_TAGS):
+                self.title = normalize_text(self._text(element))
+        return False
+
+    def close(self):
+        self.parser.close()
+
+    def _parse_entry(self, element) -> Dict:
+        fields = {}
+        links = []
+        for child in element:
+            namespace, name = self._split(child.tag)
+            if namespace not in self.NAMESPACES:
+                continue
+            if name == 'link':
+                # RSS : URL dans le texte ; Atom : attribut href, rel « alternate » par défaut
+                href = child.get('href')
+                if href is None:
+                    links.append(('alternate', self._text(child)))
+                else:
+                    links.append((child.get('rel', 'alternate'), href.strip()))
+                continue
+            fields.setdefault(name, child)
+
+        def text(*names: str) -> str:
+            for name in names:
+                if name in fields and self._text(fields[name]):
+                    return self._text(fields[name])
+            return ''
+
+        link = next((href for rel, href in links if rel == 'alternate' and href), '')
+        guid = fields.get('guid')
+        if not link and guid is not None and guid.get('isPermaLink', 'true') != 'false':
+            link = self._text(guid)
+        source = ''
+        if 'source' in fields:
+            # Atom : titre de l'élément source ; RSS : texte de l'élément
+            source_title = next((c for c in fields['source'] if self._split(c.tag)[1] == 'title'), None)
+            source = self._text(source_title if source_title is not None else fields['source'])
+        return {
+            'id': text('guid', 'id') or link,
+            'title': normalize_text(text('title')),
+            'link': link,
+            'date': text('pubDate', 'published', 'updated', 'date'),
+            'source': source,
+            'summary': text('description', 'summary', 'encoded', 'content'),
+        }
+
+# --- Classe FeedStateStore ---
+class FeedStateStore(SQLiteStore):
+    """État persistant par flux : validateurs HTTP et derniers articles vus"""
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS feed_state (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            entry_ids TEXT NOT NULL,
+            articles TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, db_file: str = Config.FEED_STATE_FILE):
+        super().__init__(db_file)
+
+    def get(self, url: str) -> Optional[Dict]:
+        rows = self._execute(
+            "SELECT etag, last_modified, entry_ids, articles FROM feed_state WHERE url = ?",
+            (url,)
+        )
+        if not rows:
+            return None
+        etag, last_modified, entry_ids, articles = rows[0]
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'entry_ids': json.loads(entry_ids),
+            'articles': json.loads(articles),
+        }
+
+    def save(self, url: str, etag: Optional[str], last_modified: Optional[str],
+             entry_ids: List[str], articles: List[Dict]):
+        self._write(
+            "INSERT OR REPLACE INTO feed_state VALUES (?, ?, ?, ?, ?, ?)",
+            (url, etag, last_modified, json.dumps(entry_ids),
+             json.dumps(articles, ensure_ascii=False), time.time())
+        )
+
+# --- Classe ArticleContentCache ---
+class ArticleContentCache(SQLiteStore):
+    """Texte extrait des articles, compressé et indexé par URL avec ses validateurs HTTP"""
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS article_content (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            content BLOB NOT NULL,
+            fetched_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, db_file: str = Config.ARTICLE_CACHE_FILE):
+        super().__init__(db_file)
+
+    def get(self, url: str) -> Optional[Dict]:
+        rows = self._execute(
+            "SELECT etag, last_modified, content, fetched_at FROM article_content WHERE url = ?",
+            (url,)
+        )
+        if not rows:
+            return None
+        etag, last_modified, content, fetched_at = rows[0]
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'content': zlib.decompress(content).decode('utf-8'),
+            'fetched_at': fetched_at,
+        }
+
+    def save(self, url: str, etag: Optional[str], last_modified: Optional[str], content: str):
+        self._write(
+            "INSERT OR REPLACE INTO article_content VALUES (?, ?, ?, ?, ?)",
+            (url, etag, last_modified, zlib.compress(content.encode('utf-8')), time.time())
+        )
+
+    def touch(self, url: str):
+        self._write("UPDATE article_content SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+# --- Classe StoryIndex ---
+class StoryIndex(SQLiteStore):
+    """Empreintes des articles déjà traités, partagées d'une exécution à l'autre"""
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS stories (
+            story_id TEXT PRIMARY KEY,
+            canonical_url TEXT NOT NULL,
+            fingerprint TEXT,
+            title TEXT,
+            source TEXT,
+            run_id TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS story_bands (
+            band INTEGER NOT NULL,
+            story_id TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_stories_url ON stories(canonical_url);
+        CREATE INDEX IF NOT EXISTS idx_stories_created_at ON stories(created_at);
+        CREATE INDEX IF NOT EXISTS idx_story_bands_band ON story_bands(band);
+        CREATE INDEX IF NOT EXISTS idx_story_bands_story ON story_bands(story_id);
+    """
+
+    def __init__(self, db_file: str = Config.STORY_INDEX_FILE,
+                 max_distance: int = Config.DEDUP_MAX_HAMMING):
+        super().__init__(db_file)
+        self.max_distance = max_distance
+        # L'empreinte est découpée en max_distance + 1 tranches : deux empreintes
+        # assez proches en partagent forcément une, ce qui permet une recherche par index
+        self.band_count = max_distance + 1
+        self.band_width = 64 // self.band_count
+
+    def bands(self, fingerprint: int) -> List[int]:
+        mask = (1 << self.band_width) - 1
+        return [i << self.band_width | fingerprint >> (i * self.band_width) & mask
+                for i in range(self.band_count)]
+
+    def find(self, canonical_url: str, fingerprint: Optional[int]) -> Optional[Dict]:
+        columns = "story_id, fingerprint, title, source, run_id"
+        rows = self._execute(f"SELECT {columns} FROM stories WHERE canonical_url = ? LIMIT 1", (canonical_url,))
+        if not rows and fingerprint is not None:
+            bands = self.bands(fingerprint)
+            candidates = self._execute(
+                f"SELECT {columns} FROM stories WHERE story_id IN "
+                f"(SELECT story_id FROM story_bands WHERE band IN ({', '.join('?' * len(bands))}))",
+                tuple(bands)
+            )
+            rows = [row for row in candidates
+                    if row[1] and hamming_distance(int(row[1], 16), fingerprint) <= self.max_distance]
+        if not rows:
+            return None
+        story_id, _, title, source, run_id = rows[0]
+        return {'story_id': story_id, 'title': title, 'source': source, 'run_id': run_id}
+
+    def add(self, story_id: str, canonical_url: str, fingerprint: Optional[int],
+            title: str, source: str, run_id: str):
+        with self._lock:
+            self._write(
+                "INSERT OR REPLACE INTO stories VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (story_id, canonical_url, f"{fingerprint:016x}" if fingerprint is not None else None,
+                 title, source, run_id, time.time())
+            )
+            self._write("DELETE FROM story_bands WHERE story_id = ?", (story_id,))
+            if fingerprint is not None:
+                self._conn.executemany(
+                    "INSERT INTO story_bands VALUES (?, ?)",
+                    [(band, story_id) for band in self.bands(fingerprint)]
+                )
+
+    def prune(self, max_age_days: float = Config.STORY_INDEX_MAX_AGE_DAYS) -> int:
+        with self._lock:
+            removed = self._write("DELETE FROM stories WHERE created_at < ?", (time.time() - max_age_days * 86400,))
+            if removed:
+                self._write("DELETE FROM story_bands WHERE story_id NOT IN (SELECT story_id FROM stories)")
+            return removed
+
+# --- Classe StoryDeduplicator ---
+class StoryDeduplicator:
+    """Regroupe les reprises d'une même dépêche avant traduction et résumé"""
+
+    NEW, DUPLICATE, SEEN = 'new', 'duplicate', 'seen'
+
+    def __init__(self, index: Optional[StoryIndex] = None, skip_seen: bool = Config.DEDUP_SKIP_SEEN):
+        self.index = index or StoryIndex()
+        self.skip_seen = skip_seen
+        self._lock = threading.Lock()
+        self.start_run()
+
+    def start_run(self, run_id: Optional[str] = None):
+        with self._lock:
+            self.run_id = run_id or new_run_id()
+            self._by_url: Dict[str, str] = {}
+            self._fingerprints: List[Tuple[int, str]] = []
+            self._also_reported: Dict[str, List[Dict]] = {}
+            self._pending: Dict[str, tuple] = {}
+            # Reprises gardées jusqu'à la publication, au cas où l'article principal n'aboutirait pas
+            self._duplicates: Dict[str, List[Dict]] = {}
+        self.index.prune()
+
+    def check(self, item: Dict) -> str:
+        """Renseigne story_id et indique si l'article est nouveau, repris ou déjà couvert"""
+        canonical = canonicalize_url(item['link'])
+        content = item['analysis'].text if item.get('analysis') else item.get('content', '')
+        fingerprint = simhash(content) if len(content) >= Config.DEDUP_MIN_CHARS else None
+        item['canonical_url'] = canonical
+        item['fingerprint'] = fingerprint
+        with self._lock:
+            primary = self._by_url.get(canonical)
+            if primary is None and fingerprint is not None:
+                primary = next((story_id for fp, story_id in self._fingerprints
+                                if hamming_distance(fp, fingerprint) <= self.index.max_distance), None)
+            if primary is not None:
+                item['story_id'] = primary
+                self._also_reported[primary].append({'source': item.get('source', ''), 'link': item['link']})
+                if primary in self._duplicates:
+                    self._duplicates[primary].append(item)
+                return self.DUPLICATE
+            if self.skip_seen:
+                previous = self.index.find(canonical, fingerprint)
+                if previous and previous['run_id'] != self.run_id:
+                    item['story_id'] = previous['story_id']
+                    return self.SEEN
+            story_id = hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:16]
+            item['story_id'] = story_id
+            self._by_url[canonical] = story_id
+            if fingerprint is not None:
+                self._fingerprints.append((fingerprint, story_id))
+            self._also_reported[story_id] = []
+            self._duplicates[story_id] = []
+            self._pending[story_id] = (canonical, fingerprint, item.get('title', ''), item.get('source', ''))
+            return self.NEW
+
+    def publish(self, story_ids: List[str]):
+        # Enregistré seulement une fois la revue écrite : une exécution interrompue
+        # ne masque pas ses articles à la reprise
+        for story_id in story_ids:
+            with self._lock:
+                pending = self._pending.pop(story_id, None)
+            if pending is not None:
+                self.index.add(story_id, *pending, run_id=self.run_id)
+
+    def also_reported_by(self, story_id: str) -> List[Dict]:
+        with self._lock:
+            return list(self._also_reported.get(story_id, []))
+
+    def settle(self, story_id: str):
+        # Dépêche écartée volontairement (mode incrémental) : ses reprises ne la remplacent pas
+        with self._lock:
+            self._duplicates.pop(story_id, None)
+
+    def orphans(self, assembled: set) -> Dict[str, List[Dict]]:
+        """Clôt les dépêches en cours ; renvoie les reprises de celles dont l'article principal manque"""
+        with self._lock:
+            waiting, self._duplicates = self._duplicates, {}
+        return {story_id: items for story_id, items in waiting.items() if story_id not in assembled}
+
+    def promote(self, item: Dict):
+        """La reprise remplace l'article principal de sa dépêche"""
+        story_id = item['story_id']
+        with self._lock:
+            self._pending[story_id] = (item['canonical_url'], item['fingerprint'],
+                                       item.get('title', ''), item.get('source', ''))
+            self._also_reported[story_id] = [entry for entry in self._also_reported.get(story_id, [])
+                                             if entry['link'] != item['link']]
+
+    def forget(self, story_id: str):
+        """Dépêche sans article publié : ses reprises suivantes seront traitées comme nouvelles"""
+        with self._lock:
+            self._by_url = {url: primary for url, primary in self._by_url.items() if primary != story_id}
+            self._fingerprints = [(fp, primary) for fp, primary in self._fingerprints if primary != story_id]
+            self._also_reported.pop(story_id, None)
+            self._pending.pop(story_id, None)
+
+    def close(self):
+        self.index.close()
+
+# --- Classe DigestArticle ---
+class DigestArticle:
+    """Article prêt à publier : ce que conservent le stockage et ce que lisent les rédacteurs de documents"""
+    __slots__ = ('title', 'link', 'date', 'published', 'source', 'summary', 'canonical_url', 'content_hash',
+                 'summary_level', 'untranslated', 'category', 'feed', 'story_id', 'also_reported_by')
+
+    def __init__(self, title: str, link: str, date: str = '', source: str = '', summary: str = '',
+                 canonical_url: Optional[str] = None, content_hash: Optional[str] = None,
+                 summary_level: int = DeadlineScheduler.FULL, untranslated: bool = False,
+                 category: Optional[str] = None,
+                 feed: Optional[str] = None, story_id: Optional[str] = None,
+                 also_reported_by: Optional[List[Dict]] = None, published: Optional[float] = None):
+        self.title = title
+        self.link = link
+        # Date telle que publiée par le flux ; published sert au tri, date à l'affichage
+        self.date = date
+        self.published = parse_timestamp(date) if published is None else published
+        self.source = source
+        self.summary = summary
+        self.canonical_url = canonical_url
+        self.content_hash = content_hash
+        self.summary_level = summary_level
+        # Traduction en échec ou hors délai : titre ou résumé restés dans la langue d'origine
+        self.untranslated = untranslated
+        self.category = category
+        self.feed = feed
+        self.story_id = story_id
+        self.also_reported_by = also_reported_by or []
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DigestArticle":
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+    @property
+    def complete(self) -> bool:
+        """Ni résumé dégradé ni traduction manquée : le résultat peut être réutilisé tel quel"""
+        return not self.summary_level and not self.untranslated
+
+    @property
+    def display_date(self) -> str:
+        return format_date_french(self.date)
+
+    def sort_key(self) -> Tuple[bool, float]:
+        # Les articles sans date lisible viennent après les autres
+        return self.published is not None, self.published or 0.0
+
+def latest_first(articles: List[DigestArticle], limit: Optional[int] = None) -> List[DigestArticle]:
+    """Du plus récent au plus ancien : fusion par tas des listes de chaque flux, arrêtée après limit articles"""
+    by_feed = {}
+    for article in articles:
+        by_feed.setdefault(article.feed, []).append(article)
+    runs = [sorted(feed_articles, key=DigestArticle.sort_key, reverse=True) for feed_articles in by_feed.values()]
+    return list(islice(heapq.merge(*runs, key=DigestArticle.sort_key, reverse=True), limit))
+
+# --- Classe ArticleResultStore ---
+class ArticleResultStore(SQLiteStore):
+    """Articles traités (titre, résumé, métadonnées), indexés par URL canonique et empreinte du texte"""
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS article_results (
+            canonical_url TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            category TEXT,
+            article TEXT NOT NULL,
+            run_id TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (canonical_url, content_hash)
+        );
+        CREATE INDEX IF NOT EXISTS idx_article_results_run ON article_results(run_id);
+        CREATE INDEX IF NOT EXISTS idx_article_results_updated_at ON article_results(updated_at);
+    """
+
+    def __init__(self, db_file: str = Config.RESULT_STORE_FILE,
+                 max_age_days: float = Config.RESULT_STORE_MAX_AGE_DAYS):
+        super().__init__(db_file)
+        self.max_age = max_age_days * 86400
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get(self, canonical_url: str, content_hash: str) -> Optional[DigestArticle]:
+        rows = self._execute(
+            "SELECT article FROM article_results WHERE canonical_url = ? AND content_hash = ?",
+            (canonical_url, content_hash)
+        )
+        return DigestArticle.from_dict(json.loads(rows[0][0])) if rows else None
+
+    def save(self, article: DigestArticle, run_id: str):
+        self._write(
+            "INSERT OR REPLACE INTO article_results VALUES (?, ?, ?, ?, ?, ?)",
+            (article.canonical_url, article.content_hash, article.category,
+             json.dumps(article.to_dict(), ensure_ascii=False), run_id, time.time())
+        )
+
+    def attach(self, articles: List[DigestArticle], run_id: str):
+        """Rattache les articles publiés à la revue de cette exécution, avec leurs autres sources"""
+        with self._lock:
+            for article in articles:
+                self.save(article, run_id)
+
+    def latest_run(self) -> Optional[str]:
+        rows = self._execute("SELECT run_id FROM article_results ORDER BY updated_at DESC LIMIT 1")
+        return rows[0][0] if rows else None
+
+    def load_run(self, run_id: str) -> Dict[str, List[DigestArticle]]:
+        by_category = {}
+        for category, article in self._execute(
+            "SELECT category, article FROM article_results WHERE run_id = ? ORDER BY updated_at", (run_id,)
+        ):
+            article = DigestArticle.from_dict(json.loads(article))
+            article.category = category or 'Sans catégorie'
+            by_category.setdefault(article.category, []).append(article)
+        return by_category
+
+    def prune(self) -> int:
+        return self._write("DELETE FROM article_results WHERE updated_at < ?", (time.time() - self.max_age,))
+
+# --- Classe TranslationBatch ---
+class TranslationBatch:
+    """Textes traduits ensemble, en deux temps : modèle local puis services externes"""
+    __slots__ = ('results', 'remote', 'untranslated', 'expires_at')
+
+    def __init__(self, texts: List[str], timeout: Optional[float] = None):
+        self.results = texts
+        # Index -> (langue, texte) à confier aux services externes
+        self.remote: Dict[int, Tuple[str, str]] = {}
+        # Textes restés dans leur langue d'origine (échec ou délai dépassé)
+        self.untranslated = set()
+        # Au-delà du délai, les textes non traduits sont rendus tels quels
+        self.expires_at = None if timeout is None else time.monotonic() + timeout
+
+    def wait(self, future: Future):
+        if self.expires_at is None:
+            return future.result()
+        return future.result(timeout=max(0.0, self.expires_at - time.monotonic()))
 
 # --- Classe TranslationManager ---
 class TranslationManager:
     """Gestionnaire de traduction avec modèles locaux et services externes"""
     
     def __init__(self, cache_file: str = Config.CACHE_FILE):
-        self.cache_file = Path(cache_file)
-        self.cache = self._load_cache()
-        self.request_count = 0
-        self.last_request_time = 0
+        self.cache = TranslationCache(cache_file)
+        self.router = ProviderRouter(['mymemory', 'libretranslate', 'googletrans'])
         
         # Modèles de traduction locaux
         self.local_translator = None
         self.marian_models = {}
         
-        # Services externes (fallback)
-        self.translator = Translator() if Translator else None
+        # Services externes (fallback), googletrans chargé à la première utilisation
+        self.translator = None
         self.session = requests.Session()
         self._setup_session()
         
-        # Charger le modèle de traduction local
-        self._load_local_translator()
+        # Le modèle de traduction local est chargé au premier texte à traduire
+        self._model_lock = threading.Lock()
+        self.inference_pool = None
+        # File commune : les textes de plusieurs articles sont traduits ensemble
+        self._local_queue = BatchQueue(
+            self._translate_local_queue_batch,
+            max_batch_size=Config.TRANSLATION_BATCH_SIZE,
+            name="marian-translator"
+        )
+        # Textes confiés aux services externes, regroupés en requêtes
+        self._remote_queue = BatchQueue(
+            self._translate_remote_queue_batch,
+            max_batch_size=Config.REMOTE_TRANSLATION_BATCH_SIZE,
+            name="remote-translator"
+        )
+        self._remote_queue.add_workers(Config.REMOTE_TRANSLATION_WORKERS - 1)
 
     def _setup_session(self):
         retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
+            total=Config.PROVIDER_RETRY_COUNT,
+            backoff_factor=0.5,
             status_forcelist=[429, 500, 502, 503, 504],
         )
         adapter = HTTPAdapter(max_retries=retry_strategy)
@@ -94,8 +1448,10 @@ class TranslationManager:
         self.session.mount("https://", adapter)
 
     def _load_local_translator(self):
-        if not HF_AVAILABLE:
+        pipeline = load_translation_pipeline()
+        if pipeline is None:
             logging.warning("Transformers non disponible, utilisation des services externes")
+            self.marian_models['en'] = None
             return
         try:
             logging.info("Chargement du modèle de traduction local...")
@@ -108,262 +1464,798 @@ class TranslationManager:
         except Exception as e:
             logging.warning(f"Impossible de charger le modèle local : {e}")
             self.local_translator = None
+        self.marian_models['en'] = self.local_translator
 
-    def _translate_with_local_model(self, text: str, src_lang: str = "en") -> str:
-        if not self.local_translator:
+    def _get_local_translator(self, src_lang: str):
+        if not Config.LOCAL_TRANSLATION:
             return None
-        try:
-            if src_lang not in ['en', 'auto']:
-                return None
-            max_length = 500
-            if len(text) > max_length:
-                chunks = [text[i:i+max_length] for i in range(0, len(text), max_length)]
-                translated_chunks = []
-                for chunk in chunks:
-                    result = self.local_translator(chunk, max_length=512)
-                    if result and len(result) > 0:
-                        translated_chunks.append(result[0]['translation_text'])
-                return ' '.join(translated_chunks)
+        if src_lang == 'auto':
+            src_lang = 'en'
+        with self._model_lock:
+            if src_lang == 'en' and src_lang not in self.marian_models:
+                self._load_local_translator()
+            elif src_lang not in self.marian_models:
+                # Un échec est mémorisé (None) pour ne pas retenter à chaque texte
+                model_name = f"Helsinki-NLP/opus-mt-{src_lang}-fr"
+                pipeline = load_translation_pipeline()
+                try:
+                    if pipeline is None:
+                        raise ImportError("transformers non installé")
+                    logging.info(f"Chargement du modèle de traduction {model_name}...")
+                    self.marian_models[src_lang] = pipeline("translation", model=model_name, device=-1)
+                except Exception as e:
+                    logging.warning(f"Modèle {model_name} indisponible : {e}")
+                    self.marian_models[src_lang] = None
+            return self.marian_models[src_lang]
+
+    def _split_segments(self, text: Union[str, TextAnalysis],
+                        max_chars: int = Config.TRANSLATION_SEGMENT_CHARS) -> List[str]:
+        segments = []
+        current = ""
+        if isinstance(text, TextAnalysis):
+            sentences = text.sentences()
+        else:
+            sentences = SENTENCE_SPLIT_RE.split(text.strip())
+        for sentence in sentences:
+            # Une phrase trop longue est coupée sur les espaces, jamais au milieu d'un mot
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(' ', 0, max_chars)
+                if cut <= 0:
+                    cut = max_chars
+                if current:
+                    segments.append(current)
+                    current = ""
+                segments.append(sentence[:cut].strip())
+                sentence = sentence[cut:].strip()
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                segments.append(current)
+                current = sentence
             else:
-                result = self.local_translator(text, max_length=512)
-                if result and len(result) > 0:
-                    return result[0]['translation_text']
-            return None
-        except Exception as e:
-            logging.warning(f"Erreur modèle local : {e}")
-            return None
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            segments.append(current)
+        return [segment for segment in segments if segment]
+
+    def _translate_with_local_model(self, text: str, src_lang: str = "en") -> str:
+        return self._translate_batch_with_local_model([text], src_lang)[0]
 
-    def _translate_with_huggingface_api(self, text: str) -> str:
+    def _translate_batch_with_local_model(self, texts: List[Union[str, TextAnalysis]],
+                                          src_lang: str = "en") -> List[Optional[str]]:
+        local_translator = self._get_local_translator(src_lang)
+        if not local_translator:
+            return [None] * len(texts)
         try:
-            url = "https://api-inference.huggingface.co/models/Helsinki-NLP/opus-mt-en-fr"
-            headers = {"Content-Type": "application/json"}
-            payload = {"inputs": text[:1000]}
-            response = self.session.post(url, json=payload, headers=headers, timeout=30)
-            if response.status_code == 200:
-                result = response.json()
-                if isinstance(result, list) and len(result) > 0:
-                    translated = result[0].get('translation_text', '')
-                    if translated:
-                        return translated
-            logging.warning(f"Hugging Face API a échoué : {response.status_code}")
-            return None
+            # Tous les segments de tous les textes partent en un seul appel au pipeline
+            segmented = [self._split_segments(text) for text in texts]
+            segments = [segment for text_segments in segmented for segment in text_segments]
+            if not segments:
+                return [None] * len(texts)
+            with METRICS.span('translate.local', src_lang=src_lang, segments=len(segments)):
+                results = local_translator(segments, max_length=512, batch_size=Config.TRANSLATION_BATCH_SIZE)
+            translated_segments = iter(result['translation_text'] for result in results)
+            translations = []
+            for text_segments in segmented:
+                parts = [next(translated_segments) for _ in text_segments]
+                translations.append(' '.join(parts) if parts else None)
+            return translations
         except Exception as e:
-            logging.warning(f"Erreur Hugging Face API : {e}")
-            return None
+            logging.warning(f"Erreur modèle local : {e}")
+            return [None] * len(texts)
 
-    def _load_cache(self) -> Dict[str, str]:
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                logging.warning(f"Impossible de charger le cache : {e}")
-        return {}
+    def _translate_local_queue_batch(self, items: List[tuple]) -> List[Optional[str]]:
+        results = [None] * len(items)
+        by_lang = {}
+        for i, (src_lang, text) in enumerate(items):
+            by_lang.setdefault(src_lang, []).append(i)
+        for src_lang, indexes in by_lang.items():
+            texts = [items[i][1] for i in indexes]
+            if self.inference_pool and self.inference_pool.alive:
+                try:
+                    translations = self.inference_pool.run('translate', texts, src_lang)
+                except RuntimeError as e:
+                    # Textes laissés aux services distants
+                    logging.error(f"Traduction locale d'un lot de {len(texts)} textes impossible : {e}")
+                    translations = [None] * len(texts)
+            else:
+                translations = self._translate_batch_with_local_model(texts, src_lang)
+            for i, translation in zip(indexes, translations):
+                results[i] = translation
+        return results
 
-    def _save_cache(self):
-        try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logging.error(f"Impossible de sauvegarder le cache : {e}")
+    # Chaque service renvoie None quand la requête échoue (statut HTTP, réponse illisible), sinon une
+    # traduction par segment, None pour un segment non traduit sans que le service soit en cause
 
-    def _translate_with_mymemory(self, text: str, src_lang: str = "en", dest_lang: str = "fr") -> str:
+    def _translate_with_mymemory(self, segments: List[str], src_lang: str = "en",
+                                 dest_lang: str = "fr") -> Optional[List[Optional[str]]]:
+        # Une seule requête pour plusieurs segments courts, un par ligne
         try:
-            url = "https://api.mymemory.translated.net/get"
+            url = Config.MYMEMORY_URL
             params = {
-                "q": text[:500],
+                "q": "\n".join(segments),
                 "langpair": f"{src_lang}|{dest_lang}"
             }
             response = self.session.get(url, params=params, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 if data.get("responseStatus") == 200:
-                    translated_text = data["responseData"]["translatedText"]
-                    if translated_text.lower() != text.lower():
-                        return translated_text
-            logging.warning(f"MyMemory API a échoué pour : {text[:50]}...")
-            return None
+                    lines = data["responseData"]["translatedText"].split("\n")
+                    if len(lines) == len(segments):
+                        # Un segment renvoyé tel quel (nom propre, sigle…) n'a pas été traduit
+                        return [
+                            line.strip() if line.strip().lower() != segment.lower() else None
+                            for line, segment in zip(lines, segments)
+                        ]
+                    logging.warning(f"MyMemory : {len(lines)} lignes reçues pour {len(segments)} segments")
+                    return None
+            logging.warning(f"MyMemory API a échoué pour : {segments[0][:50]}...")
         except Exception as e:
             logging.warning(f"Erreur MyMemory API : {e}")
-            return None
+        return None
 
-    def _translate_with_libre(self, text: str, src_lang: str = "en", dest_lang: str = "fr") -> str:
+    def _translate_with_libre(self, segments: List[str], src_lang: str = "en",
+                              dest_lang: str = "fr") -> Optional[List[Optional[str]]]:
         try:
-            url = "https://libretranslate.de/translate"
+            url = Config.LIBRETRANSLATE_URL
             data = {
-                "q": text[:1000],
+                "q": segments,
                 "source": src_lang,
                 "target": dest_lang,
                 "format": "text"
             }
-            response = self.session.post(url, data=data, timeout=15)
+            response = self.session.post(url, json=data, timeout=15)
             if response.status_code == 200:
-                result = response.json()
-                if "translatedText" in result:
-                    return result["translatedText"]
-            logging.warning(f"LibreTranslate a échoué pour : {text[:50]}...")
-            return None
+                translated = response.json().get("translatedText")
+                if isinstance(translated, list) and len(translated) == len(segments):
+                    return [text or None for text in translated]
+            logging.warning(f"LibreTranslate a échoué pour : {segments[0][:50]}...")
         except Exception as e:
             logging.warning(f"Erreur LibreTranslate : {e}")
-            return None
+        return None
 
-    def _translate_with_googletrans(self, text: str) -> str:
+    def _translate_with_googletrans(self, segments: List[str]) -> Optional[List[Optional[str]]]:
+        if self.translator is None:
+            try:
+                from googletrans import Translator
+                self.translator = Translator()
+            except ImportError:
+                self.translator = False
         if not self.translator:
             return None
         try:
-            self._rate_limit()
-            translated = self.translator.translate(text, src='auto', dest='fr')
-            if translated and hasattr(translated, 'text') and translated.text:
-                return translated.text
-            return None
+            translated = self.translator.translate(segments, src='auto', dest='fr')
+            return [getattr(item, 'text', None) or None for item in translated]
         except Exception as e:
             logging.warning(f"Erreur googletrans : {e}")
             return None
 
-    def _rate_limit(self):
-        current_time = time.time()
-        if current_time - self.last_request_time < 2:
-            time.sleep(2)
-        self.last_request_time = current_time
-
-    def translate_to_french(self, text: str) -> str:
-        if not text or text.strip() == "":
-            return text
-        text_key = text.strip()[:500]
-        if text_key in self.cache:
-            return self.cache[text_key]
-        src_lang = "en"
-        try:
-            detected_lang = detect(text)
-            if detected_lang == 'fr':
-                self.cache[text_key] = text
-                return text
-            src_lang = detected_lang
-        except:
-            pass
-        translation_methods = [
-            lambda: self._translate_with_mymemory(text, src_lang),
-            lambda: self._translate_with_libre(text, src_lang),
-            lambda: self._translate_with_googletrans(text)
+    @staticmethod
+    def _pack_requests(segments: List[str], max_chars: int) -> List[List[int]]:
+        """Regroupe les segments consécutifs en requêtes d'au plus max_chars caractères"""
+        packs = []
+        current = []
+        size = 0
+        for k, segment in enumerate(segments):
+            if current and size + 1 + len(segment) > max_chars:
+                packs.append(current)
+                current = []
+                size = 0
+            size += len(segment) + (1 if current else 0)
+            current.append(k)
+        if current:
+            packs.append(current)
+        return packs
+
+    def _translate_with_provider(self, provider: str, texts: List[str], src_lang: str) -> List[Optional[str]]:
+        send = {
+            'mymemory': lambda batch: self._translate_with_mymemory(batch, src_lang),
+            'libretranslate': lambda batch: self._translate_with_libre(batch, src_lang),
+            'googletrans': lambda batch: self._translate_with_googletrans(batch),
+        }[provider]
+        # Textes longs découpés en fin de phrase à la taille acceptée par le service
+        segmented = [
+            [WHITESPACE_RE.sub(' ', segment) for segment in
+             self._split_segments(text, Config.PROVIDER_SEGMENT_CHARS[provider])]
+            for text in texts
         ]
-        for i, method in enumerate(translation_methods):
+        segments = [segment for text_segments in segmented for segment in text_segments]
+        translated = [None] * len(segments)
+        for pack in self._pack_requests(segments, Config.PROVIDER_REQUEST_CHARS[provider]):
+            if not self.router.acquire(provider):
+                # Service saturé ou suspendu : le reste passe au service suivant
+                break
+            batch = [segments[k] for k in pack]
+            outputs = None
+            start = time.perf_counter()
             try:
-                result = method()
-                if result and result.strip() and len(result.strip()) > 10:
-                    self.cache[text_key] = result
-                    self.request_count += 1
-                    if self.request_count % 10 == 0:
-                        self._save_cache()
-                    logging.info(f"Traduction réussie avec méthode {i+1}")
-                    return result
+                with METRICS.span(f'translate.{provider}', chars=sum(map(len, batch)), segments=len(batch)) as span:
+                    outputs = send(batch)
+                    if outputs is None:
+                        span['outcome'] = 'failed'
+                    elif not all(outputs):
+                        span['outcome'] = 'partial'
             except Exception as e:
-                logging.warning(f"Méthode de traduction {i+1} a échoué : {e}")
+                logging.warning(f"Service de traduction {provider} a échoué : {e}")
+            # La santé du service dépend de sa réponse, pas des segments qu'il a laissés tels quels
+            self.router.record(provider, outputs is not None, time.perf_counter() - start)
+            METRICS.increment('provider_request', provider=provider)
+            for k, output in zip(pack, outputs or [None] * len(batch)):
+                translated[k] = output
+        # Réassemblage dans l'ordre : un texte n'est traduit que si tous ses segments le sont
+        results = []
+        position = 0
+        for text_segments in segmented:
+            parts = translated[position:position + len(text_segments)]
+            position += len(text_segments)
+            results.append(' '.join(parts) if parts and all(parts) else None)
+        return results
+
+    def translate_to_french(self, text: str, src_lang: Optional[str] = None,
+                            timeout: Optional[float] = None) -> str:
+        return self.translate_many([text], src_langs=[src_lang], timeout=timeout)[0]
+
+    def translate_many(self, texts: List[Union[str, TextAnalysis]],
+                       src_langs: Optional[List[Optional[str]]] = None,
+                       timeout: Optional[float] = None) -> List[str]:
+        return self.translate_remote(self.translate_local(texts, src_langs, timeout)).results
+
+    def translate_local(self, texts: List[Union[str, TextAnalysis]],
+                        src_langs: Optional[List[Optional[str]]] = None,
+                        timeout: Optional[float] = None) -> TranslationBatch:
+        """Cache puis modèle MarianMT local ; les textes restants sont laissés à translate_remote"""
+        # Une analyse fournit la langue et le découpage en phrases déjà calculés
+        batch = TranslationBatch([TextAnalysis.text_of(entry) for entry in texts], timeout)
+        pending = {}
+        for i, entry in enumerate(texts):
+            text = batch.results[i]
+            if not text or text.strip() == "":
                 continue
-        logging.warning(f"Toutes les méthodes de traduction ont échoué pour : {text[:50]}...")
-        self.cache[text_key] = text
-        return text
-
-    def format_date_french(self, date_str: str) -> str:
-        if not date_str:
-            return ""
-        months_fr = {
-            'January': 'janvier', 'February': 'février', 'March': 'mars', 'April': 'avril',
-            'May': 'mai', 'June': 'juin', 'July': 'juillet', 'August': 'août',
-            'September': 'septembre', 'October': 'octobre', 'November': 'novembre', 'December': 'décembre',
-            'Jan': 'janv.', 'Feb': 'févr.', 'Mar': 'mars', 'Apr': 'avr.',
-            'May': 'mai', 'Jun': 'juin', 'Jul': 'juill.', 'Aug': 'août',
-            'Sep': 'sept.', 'Oct': 'oct.', 'Nov': 'nov.', 'Dec': 'déc.',
-            'Monday': 'lundi', 'Tuesday': 'mardi', 'Wednesday': 'mercredi', 'Thursday': 'jeudi',
-            'Friday': 'vendredi', 'Saturday': 'samedi', 'Sunday': 'dimanche',
-            'Mon': 'lun', 'Tue': 'mar', 'Wed': 'mer', 'Thu': 'jeu',
-            'Fri': 'ven', 'Sat': 'sam', 'Sun': 'dim'
-        }
-        try:
-            parsed_date = dateutil.parser.parse(date_str)
-            french_date = parsed_date.strftime("%d %B %Y à %H:%M")
-            for eng, fr in months_fr.items():
-                french_date = french_date.replace(eng, fr)
-            return french_date
-        except:
-            french_date = date_str
-            for eng, fr in months_fr.items():
-                french_date = french_date.replace(eng, fr)
-            return french_date
-
-    def __del__(self):
-        self._save_cache()
+            src_lang = src_langs[i] if src_langs else None
+            if src_lang is None and isinstance(entry, TextAnalysis):
+                src_lang = entry.language
+            if src_lang is None:
+                src_lang = "en"
+                try:
+                    src_lang = detect_language(text)
+                except:
+                    pass
+            if src_lang == 'fr':
+                continue
+            cached = self.cache.get(text, src_lang)
+            METRICS.increment('translation_cache', result='hit' if cached is not None else 'miss')
+            if cached is not None:
+                batch.results[i] = cached
+                continue
+            # Premier niveau : modèle MarianMT local, via la file partagée
+            pending[i] = (src_lang, self._local_queue.submit((src_lang, entry)))
+        for i, (src_lang, future) in pending.items():
+            text = batch.results[i]
+            try:
+                result = batch.wait(future)
+            except FuturesTimeoutError:
+                METRICS.increment('deadline_exceeded', stage='translate')
+                batch.untranslated.add(i)
+                continue
+            except Exception:
+                result = None
+            if result and result.strip():
+                self.cache.set(text, result, src_lang)
+                batch.results[i] = result
+                continue
+            METRICS.increment('provider_fallback', provider='local')
+            batch.remote[i] = (src_lang, text)
+        return batch
 
-# --- Classe ArticleSummarizer ---
-class ArticleSummarizer:
-    def __init__(self):
+    def translate_remote(self, batch: TranslationBatch) -> TranslationBatch:
+        """Services externes pour les textes que le modèle local n'a pas traduits"""
+        # Les textes de plusieurs articles partagent les requêtes
+        futures = {i: self._remote_queue.submit(entry) for i, entry in batch.remote.items()}
+        batch.remote = {}
+        for i, future in futures.items():
+            try:
+                result = batch.wait(future)
+                if result is None:
+                    # Tous les services ont échoué : le texte reste dans sa langue
+                    batch.untranslated.add(i)
+                else:
+                    batch.results[i] = result
+            except FuturesTimeoutError:
+                METRICS.increment('deadline_exceeded', stage='translate')
+                batch.untranslated.add(i)
+            except Exception as e:
+                logging.warning(f"Traduction externe impossible : {e}")
+                batch.untranslated.add(i)
+        return batch
+
+    def _translate_remote_queue_batch(self, items: List[tuple]) -> List[Optional[str]]:
+        results = [None] * len(items)
+        by_lang = {}
+        for i, (src_lang, text) in enumerate(items):
+            by_lang.setdefault(src_lang, []).append(i)
+        for src_lang, indexes in by_lang.items():
+            translations = self._translate_with_services([items[i][1] for i in indexes], src_lang)
+            for i, translation in zip(indexes, translations):
+                results[i] = translation
+        return results
+
+    def _translate_with_services(self, texts: List[str], src_lang: str) -> List[Optional[str]]:
+        # None pour les textes qu'aucun service n'a traduits
+        results: List[Optional[str]] = [None] * len(texts)
+        remaining = list(range(len(texts)))
+        # Ordre recalculé à chaque lot : un service lent, saturé ou suspendu passe après les autres
+        for provider in self.router.ordered():
+            if not remaining:
+                break
+            translations = self._translate_with_provider(provider, [texts[i] for i in remaining], src_lang)
+            failed = []
+            for i, translation in zip(remaining, translations):
+                if translation and translation.strip():
+                    self.cache.set(texts[i], translation, src_lang)
+                    results[i] = translation
+                else:
+                    failed.append(i)
+            if failed:
+                METRICS.increment('provider_failure', len(failed), provider=provider)
+                METRICS.increment('provider_fallback', len(failed), provider=provider)
+            remaining = failed
+        # Les échecs ne sont pas mis en cache : le texte sera retenté au prochain passage
+        for i in remaining:
+            logging.warning(f"Toutes les méthodes de traduction ont échoué pour : {texts[i][:50]}...")
+        return results
+
+    def close(self):
+        stats = self.cache.stats()
+        logging.info(
+            f"Cache de traduction : {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%}), {stats['writes']} écritures, {stats['evictions']} évictions"
+        )
+        for provider, health in self.router.stats().items():
+            logging.info(
+                f"Service {provider} : latence {health['latency']:.2f} s, succès {health['success_rate']:.0%}"
+                + (", suspendu" if health['open'] else "")
+            )
+        self.cache.close()
+
+# --- Classe SummarizerBackend ---
+class SummarizerBackend:
+    """Interface d'un moteur de résumé : chargement et résumé d'un lot"""
+    # Caractères transmis au moteur, coupés en fin de phrase
+    max_input_chars = Config.MAX_CONTENT_LENGTH
+    # Moteur assez rapide pour résumer sur place, sans file ni processus d'inférence
+    inline = False
+    # Moteur indépendant de la langue : le texte original peut être résumé avant traduction
+    multilingual = False
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def load(self):
+        pass
+
+    def summarize(self, cleaned_contents: List[str], num_beams: Optional[int] = None) -> List[str]:
+        raise NotImplementedError
+
+# --- Classe BartBackend ---
+class BartBackend(SummarizerBackend):
+    """Modèle BART (ou distillé) avec recherche en faisceau ou gloutonne, quantifiable en int8"""
+
+    def __init__(self, name: str, model: str, num_beams: int = 4, quantize: bool = False):
+        super().__init__(name)
+        self.model_name = model
+        self.num_beams = num_beams
+        self.quantize = quantize
         self.tokenizer = None
         self.model = None
-        self._load_model()
 
-    def _load_model(self):
+    def load(self):
         try:
-            logging.info("Chargement du modèle BART...")
-            self.tokenizer = BartTokenizer.from_pretrained("facebook/bart-large-cnn")
-            self.model = BartForConditionalGeneration.from_pretrained("facebook/bart-large-cnn")
-            logging.info("Modèle BART chargé avec succès")
+            from transformers import BartTokenizer, BartForConditionalGeneration
+            logging.info(f"Chargement du modèle {self.model_name} (profil {self.name})...")
+            self.tokenizer = BartTokenizer.from_pretrained(self.model_name)
+            model = BartForConditionalGeneration.from_pretrained(self.model_name)
+            if self.quantize:
+                import torch
+                # Quantification dynamique : poids des couches linéaires en int8
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            model.eval()
+            self.model = model
+            logging.info(f"Modèle {self.model_name} chargé avec succès")
         except Exception as e:
             logging.error(f"Erreur lors du chargement du modèle : {e}")
             raise
 
-    def summarize_article(self, content: str) -> str:
-        if not content or len(content) < 100:
-            return content
+    def summarize(self, cleaned_contents: List[str], num_beams: Optional[int] = None) -> List[str]:
+        # num_beams ne peut que réduire la recherche du profil (mode dégradé)
+        num_beams = min(num_beams or self.num_beams, self.num_beams)
+        inputs = self.tokenizer(
+            cleaned_contents,
+            max_length=1024,
+            return_tensors="pt",
+            truncation=True,
+            padding=True
+        )
+        summary_ids = self.model.generate(
+            inputs.input_ids,
+            attention_mask=inputs.attention_mask,
+            num_beams=num_beams,
+            min_length=Config.MIN_SUMMARY_LENGTH,
+            max_length=Config.MAX_SUMMARY_LENGTH,
+            early_stopping=num_beams > 1,
+            no_repeat_ngram_size=3
+        )
+        return self.tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
+
+# --- Classe ExtractiveBackend ---
+class ExtractiveBackend(SummarizerBackend):
+    """TextRank sur des vecteurs TF-IDF de phrases : les phrases les plus centrales, dans l'ordre du texte"""
+    max_input_chars = Config.EXTRACTIVE_MAX_INPUT_CHARS
+    inline = True
+    multilingual = True
+
+    def __init__(self, name: str, sentences: int = 3, max_chars: int = 600):
+        super().__init__(name)
+        self.sentences = sentences
+        self.max_chars = max_chars
+        self.np = None
+
+    def load(self):
+        import numpy
+        self.np = numpy
+
+    def summarize(self, cleaned_contents: List[str], num_beams: Optional[int] = None) -> List[str]:
+        return [self.summarize_one(cleaned) for cleaned in cleaned_contents]
+
+    def summarize_one(self, cleaned: str) -> str:
+        analysis = TextAnalysis(cleaned)
+        sentences = analysis.sentences()
+        # Peu de phrases, ou aucune fin de phrase reconnue : le début du texte, à la longueur d'un résumé
+        max_chars = self.max_chars or Config.MAX_SUMMARY_LENGTH
+        if len(sentences) <= self.sentences:
+            return analysis.head(max_chars)[0]
+        chosen = []
+        length = 0
+        for index in self.np.argsort(-self.rank(sentences), kind='stable'):
+            if len(chosen) == self.sentences:
+                break
+            # Au moins une phrase, même plus longue que max_chars
+            if chosen and length + len(sentences[index]) > max_chars:
+                continue
+            chosen.append(index)
+            length += len(sentences[index]) + 1
+        return TextAnalysis(' '.join(sentences[index] for index in sorted(chosen))).head(max_chars)[0]
+
+    def rank(self, sentences: List[str]):
+        np = self.np
+        vocabulary = {}
+        rows, columns = [], []
+        for row, sentence in enumerate(sentences):
+            for word in WORD_RE.findall(sentence.lower()):
+                rows.append(row)
+                columns.append(vocabulary.setdefault(word, len(vocabulary)))
+        n = len(sentences)
+        counts = np.zeros((n, max(len(vocabulary), 1)))
+        np.add.at(counts, (rows, columns), 1.0)
+        # TF-IDF lissé, lignes normalisées : le produit matriciel donne les similarités cosinus
+        idf = np.log((1.0 + n) / (1.0 + np.count_nonzero(counts, axis=0))) + 1.0
+        vectors = counts * idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms > 0, norms, 1.0)
+        similarity = vectors @ vectors.T
+        np.fill_diagonal(similarity, 0.0)
+        # Matrice de transition : une phrase isolée renvoie uniformément vers les autres
+        totals = similarity.sum(axis=1, keepdims=True)
+        transition = np.where(totals > 0, similarity / np.where(totals > 0, totals, 1.0), 1.0 / n)
+        damping = Config.TEXTRANK_DAMPING
+        scores = np.full(n, 1.0 / n)
+        for _ in range(Config.TEXTRANK_ITERATIONS):
+            updated = (1.0 - damping) / n + damping * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < 1e-6:
+                return updated
+            scores = updated
+        return scores
+
+SUMMARIZER_ENGINES = {'bart': BartBackend, 'extractive': ExtractiveBackend}
+
+def summarizer_engine(profile: str) -> type:
+    if profile not in Config.SUMMARY_PROFILES:
+        raise ValueError(f"Profil de résumé inconnu : {profile} (disponibles : {', '.join(Config.SUMMARY_PROFILES)})")
+    return SUMMARIZER_ENGINES[Config.SUMMARY_PROFILES[profile].get('engine', 'bart')]
+
+def create_summarizer_backend(profile: str) -> SummarizerBackend:
+    settings = {key: value for key, value in Config.SUMMARY_PROFILES[profile].items() if key != 'engine'}
+    return summarizer_engine(profile)(profile, **settings)
+
+# --- Classe ArticleSummarizer ---
+class ArticleSummarizer:
+    def __init__(self, profile: str = Config.DEFAULT_SUMMARY_PROFILE):
+        self.profile = profile
+        # Les moteurs sont chargés au premier lot qui les utilise
+        self.backends = {}
+        self._backend_lock = threading.Lock()
+        self.inference_pool = None
+        # Les threads des flux déposent leurs articles dans une file unique,
+        # consommée par un seul thread qui appelle generate par lots
+        self._queue = BatchQueue(
+            self._summarize_queue_batch,
+            max_batch_size=Config.SUMMARY_BATCH_SIZE,
+            name="bart-summarizer",
+            bucket=self._length_bucket
+        )
+
+    @staticmethod
+    def _length_bucket(item: tuple) -> tuple:
+        # Mêmes réglages et longueur voisine, mesurée sur le texte que verra generate :
+        # peu de remplissage dans le lot
+        profile, num_beams, analysis = item
+        tokens = analysis.head(summarizer_engine(profile).max_input_chars)[1]
+        return profile, num_beams, tokens // Config.SUMMARY_BUCKET_TOKENS
+
+    def get_backend(self, profile: Optional[str] = None) -> SummarizerBackend:
+        profile = profile or self.profile
+        with self._backend_lock:
+            if profile not in self.backends:
+                backend = create_summarizer_backend(profile)
+                backend.load()
+                self.backends[profile] = backend
+            return self.backends[profile]
+
+    def ensure_model(self):
+        self.get_backend()
+
+    def resolve_profile(self, content: Union[str, TextAnalysis], profile: Optional[str] = None) -> str:
+        """Profil de la catégorie s'il y en a un, sinon celui des brèves ou le profil par défaut"""
+        if profile:
+            return profile
+        if Config.SHORT_ARTICLE_PROFILE and len(TextAnalysis.text_of(content)) < Config.SHORT_ARTICLE_CHARS:
+            return Config.SHORT_ARTICLE_PROFILE
+        return self.profile
+
+    def summarize_article(self, content: Union[str, TextAnalysis], profile: Optional[str] = None,
+                          level: int = DeadlineScheduler.FULL,
+                          timeout: Optional[float] = None) -> Tuple[str, int]:
+        """Retourne le résumé et le niveau de dégradation effectivement appliqué"""
+        analysis = TextAnalysis.of(content)
+        if len(analysis.text) < 100:
+            return analysis.text, DeadlineScheduler.FULL
+        profile = self.resolve_profile(analysis, profile)
+        # Dégradation quand le budget s'épuise : moins de faisceaux, profil moins coûteux, troncature
+        if level >= DeadlineScheduler.TRUNCATE:
+            return self.truncate(analysis.head(Config.MAX_CONTENT_LENGTH)[0]), DeadlineScheduler.TRUNCATE
+        num_beams = Config.DEGRADED_NUM_BEAMS if level >= DeadlineScheduler.FEWER_BEAMS else None
+        if level >= DeadlineScheduler.CHEAPER_PROFILE and not summarizer_engine(profile).inline:
+            profile = Config.DEGRADED_SUMMARY_PROFILE
+        if summarizer_engine(profile).inline:
+            summary, failed = self._summarize_batch([analysis], profile)[0]
+        else:
+            future = self._queue.submit((profile, num_beams, analysis))
+            try:
+                summary, failed = future.result(timeout=timeout)
+            except FuturesTimeoutError:
+                # Le lot finira en arrière-plan ; l'article n'attend pas au-delà de son budget
+                METRICS.increment('deadline_exceeded', stage='summarize')
+                return self.truncate(analysis.head(Config.MAX_CONTENT_LENGTH)[0]), DeadlineScheduler.TRUNCATE
+        # Moteur en erreur ou processus d'inférence perdu : le texte a été tronqué
+        return summary, DeadlineScheduler.TRUNCATE if failed else level
+
+    def _summarize_queue_batch(self, items: List[tuple]) -> List[Tuple[str, bool]]:
+        results = [None] * len(items)
+        by_settings = {}
+        for i, (profile, num_beams, content) in enumerate(items):
+            by_settings.setdefault((profile, num_beams), []).append(i)
+        for (profile, num_beams), indexes in by_settings.items():
+            contents = [items[i][2] for i in indexes]
+            if self.inference_pool and self.inference_pool.alive:
+                try:
+                    summaries = self.inference_pool.run('summarize', contents, profile, num_beams)
+                except RuntimeError as e:
+                    logging.error(f"Erreur lors du résumé d'un lot de {len(contents)} articles : {e}")
+                    summaries = [
+                        (self.truncate(TextAnalysis.of(content).head(Config.MAX_CONTENT_LENGTH)[0]), True)
+                        for content in contents
+                    ]
+            else:
+                summaries = self._summarize_batch(contents, profile, num_beams)
+            for i, summary in zip(indexes, summaries):
+                results[i] = summary
+        return results
+
+    @staticmethod
+    def truncate(cleaned: str) -> str:
+        return cleaned[:Config.MAX_SUMMARY_LENGTH] + "..."
+
+    def summarize_batch(self, contents: List[Union[str, TextAnalysis]], profile: Optional[str] = None,
+                        num_beams: Optional[int] = None) -> List[str]:
+        return [summary for summary, _ in self._summarize_batch(contents, profile, num_beams)]
+
+    def _summarize_batch(self, contents: List[Union[str, TextAnalysis]], profile: Optional[str] = None,
+                         num_beams: Optional[int] = None) -> List[Tuple[str, bool]]:
+        # (résumé, échec) : un échec du moteur donne le texte tronqué, à refaire plus tard
+        analyses = [TextAnalysis.of(content) for content in contents]
+        summaries = [(analysis.text, False) for analysis in analyses]
+        if all(len(analysis.text) < 100 for analysis in analyses):
+            return summaries
+        backend = self.get_backend(profile)
+        # Texte coupé en fin de phrase plutôt que tronqué par le tokenizer
+        pending = [
+            (i,) + analysis.head(backend.max_input_chars)
+            for i, analysis in enumerate(analyses)
+            if len(analysis.text) >= 100
+        ]
+        # Regroupement par longueur en tokens pour limiter le padding
+        pending.sort(key=lambda entry: entry[2])
+        for start in range(0, len(pending), Config.SUMMARY_BATCH_SIZE):
+            bucket = pending[start:start + Config.SUMMARY_BATCH_SIZE]
+            cleaned_contents = [cleaned for _, cleaned, _ in bucket]
+            for (i, _, _), summary in zip(bucket, self._summarize_bucket(backend, cleaned_contents, num_beams)):
+                summaries[i] = summary
+        return summaries
+
+    def _summarize_bucket(self, backend: SummarizerBackend, cleaned_contents: List[str],
+                          num_beams: Optional[int] = None) -> List[Tuple[str, bool]]:
         try:
-            cleaned_content = self._clean_content(content)
-            inputs = self.tokenizer(
-                [cleaned_content],
-                max_length=1024,
-                return_tensors="pt",
-                truncation=True
-            )
-            summary_ids = self.model.generate(
-                inputs.input_ids,
-                num_beams=4,
-                min_length=Config.MIN_SUMMARY_LENGTH,
-                max_length=Config.MAX_SUMMARY_LENGTH,
-                early_stopping=True,
-                no_repeat_ngram_size=3
-            )
-            summary = self.tokenizer.decode(summary_ids[0], skip_special_tokens=True)
-            return self._clean_summary(summary)
+            with METRICS.span('generate', profile=backend.name, batch_size=len(cleaned_contents), num_beams=num_beams):
+                summaries = backend.summarize(cleaned_contents, num_beams)
+            return [(normalize_text(summary), False) for summary in summaries]
         except Exception as e:
-            logging.error(f"Erreur lors du résumé : {e}")
-            return cleaned_content[:Config.MAX_SUMMARY_LENGTH] + "..."
+            logging.error(f"Erreur lors du résumé d'un lot de {len(cleaned_contents)} articles : {e}")
+            return [(self.truncate(cleaned), True) for cleaned in cleaned_contents]
 
-    def _clean_content(self, content: str) -> str:
-        content = re.sub(r'<.*?>', '', content)
-        content = re.sub(r'\s+', ' ', content)
-        return content.strip()[:Config.MAX_CONTENT_LENGTH]
+# --- Classe InferenceProcessPool ---
+def _inference_worker(summarizer: ArticleSummarizer, translator: "TranslationManager",
+                      threads: int, tasks, results, current):
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    # Mesures héritées du parent au fork : seules celles des tâches de ce processus sont renvoyées
+    METRICS.drain()
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        task_id, kind, args = task
+        # Écrit en mémoire partagée, sans passer par la file : si le processus meurt, le parent sait
+        # quelle tâche échoue (la valeur reste en place jusqu'à la tâche suivante)
+        current.value = task_id
+        try:
+            if kind == 'summarize':
+                result = summarizer._summarize_batch(*args)
+            else:
+                result = translator._translate_batch_with_local_model(*args)
+            results.put((task_id, True, result, METRICS.drain()))
+        except Exception as e:
+            results.put((task_id, False, f"{type(e).__name__}: {e}", METRICS.drain()))
 
-    def _clean_summary(self, summary: str) -> str:
-        summary = re.sub(r'<.*?>', '', summary)
-        summary = re.sub(r'\s+', ' ', summary)
-        return summary.strip()
+class InferenceProcessPool:
+    """Processus d'inférence forkés après le chargement des modèles, qui partagent leurs poids en copie sur écriture"""
+
+    def __init__(self, summarizer: ArticleSummarizer, translator: "TranslationManager", processes: int,
+                 profiles: Optional[List[str]] = None):
+        self.summarizer = summarizer
+        self.translator = translator
+        self.processes = processes
+        self.profiles = profiles or [summarizer.profile]
+        self._futures = {}
+        self._futures_lock = threading.Lock()
+        self._next_id = 0
+        self._workers = []
+        self._current = {}  # processus -> dernière tâche reçue
+
+    def start(self) -> bool:
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            logging.warning("fork indisponible sur ce système, inférence dans le processus principal")
+            return False
+        # Chargement dans le parent : les enfants héritent des poids sans les recopier
+        for profile in self.profiles:
+            self.summarizer.get_backend(profile)
+        for src_lang in Config.PRELOAD_TRANSLATION_LANGS:
+            self.translator._get_local_translator(src_lang)
+        # Les objets déjà créés sortent du ramasse-miettes, qui sinon toucherait leurs pages
+        gc.freeze()
+        threads = Config.INFERENCE_THREADS_PER_PROCESS or max(1, (os.cpu_count() or 1) // self.processes)
+        context = multiprocessing.get_context('fork')
+        self._tasks = context.Queue()
+        self._results = context.Queue()
+        for i in range(self.processes):
+            current = context.Value('q', -1, lock=False)
+            worker = context.Process(
+                target=_inference_worker,
+                args=(self.summarizer, self.translator, threads, self._tasks, self._results, current),
+                name=f"inference-{i}",
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+            self._current[worker.name] = current
+        self._collector = threading.Thread(target=self._collect, name="inference-results", daemon=True)
+        self._collector.start()
+        logging.info(f"{self.processes} processus d'inférence démarrés ({threads} threads torch chacun)")
+        return True
+
+    @property
+    def alive(self) -> bool:
+        return any(worker.is_alive() for worker in self._workers)
+
+    def submit(self, kind: str, *args) -> Future:
+        future = Future()
+        with self._futures_lock:
+            task_id = self._next_id
+            self._next_id += 1
+            self._futures[task_id] = future
+        self._tasks.put((task_id, kind, args))
+        return future
+
+    def run(self, kind: str, *args):
+        """Exécute une tâche dans un processus d'inférence ; RuntimeError si elle échoue ou reste sans réponse"""
+        try:
+            return self.submit(kind, *args).result(timeout=Config.INFERENCE_TASK_TIMEOUT)
+        except FuturesTimeoutError:
+            METRICS.increment('inference_task_timeout', kind=kind)
+            raise RuntimeError(f"tâche '{kind}' sans réponse après {Config.INFERENCE_TASK_TIMEOUT} s")
+
+    def _collect(self):
+        while True:
+            try:
+                message = self._results.get(timeout=Config.INFERENCE_POLL_INTERVAL)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            if message is None:
+                return
+            task_id, ok, result, metrics = message
+            METRICS.merge(*metrics)
+            self._resolve(task_id, None if ok else RuntimeError(result), result)
+            self._check_workers()
+
+    def _resolve(self, task_id: int, error: Optional[Exception], result=None):
+        with self._futures_lock:
+            future = self._futures.pop(task_id, None)
+        if future is None:
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _check_workers(self):
+        dead = [worker for worker in self._workers if not worker.is_alive()]
+        if dead:
+            self._workers = [worker for worker in self._workers if worker not in dead]
+        for worker in dead:
+            METRICS.increment('inference_worker_died')
+            logging.error(f"Processus d'inférence {worker.name} arrêté (code {worker.exitcode})")
+            # Sans effet si le résultat de cette tâche est déjà arrivé
+            task_id = self._current.pop(worker.name).value
+            if task_id >= 0:
+                self._resolve(task_id, RuntimeError(f"processus {worker.name} arrêté pendant la tâche"))
+        if not self._workers:
+            # Plus aucun processus : les tâches en attente ne seront jamais traitées
+            with self._futures_lock:
+                task_ids = list(self._futures)
+            for task_id in task_ids:
+                self._resolve(task_id, RuntimeError("aucun processus d'inférence actif"))
+
+    def close(self):
+        workers = list(self._workers)
+        for _ in workers:
+            self._tasks.put(None)
+        for worker in workers:
+            worker.join(timeout=10)
+        if hasattr(self, '_collector'):
+            self._results.put(None)
+            self._collector.join(timeout=10)
+        self._workers = []
 
 # --- Classe ArticleExtractor ---
 class ArticleExtractor:
-    def __init__(self):
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=Config.RETRY_COUNT,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+    def __init__(self, session: Optional[requests.Session] = None):
+        self.session = session or create_http_session()
+        self.throttle = HostThrottle()
+        self.cache = ArticleContentCache()
 
     def extract_article_content(self, article_url: str, fallback_text: str = "") -> str:
         try:
-            article = newspaper.Article(article_url)
-            article.download()
-            article.parse()
-            content = article.text
+            content = self._fetch_content(article_url)
             if content and len(content) > 100:
                 return content
             else:
@@ -373,77 +2265,61 @@ class ArticleExtractor:
             logging.warning(f"Impossible d'extraire l'article {article_url} : {e}")
             return fallback_text
 
-# --- Classe RSSProcessor ---
-class RSSProcessor:
-    def __init__(self):
-        self.translator = TranslationManager()
-        self.summarizer = ArticleSummarizer()
-        self.extractor = ArticleExtractor()
+    def _fetch_content(self, article_url: str) -> str:
+        cached = self.cache.get(article_url)
+        if cached and time.time() - cached['fetched_at'] < Config.ARTICLE_CACHE_FRESH_HOURS * 3600:
+            METRICS.increment('article_cache', result='fresh')
+            return cached['content']
+        headers = {}
+        if cached and cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+        with self.throttle.slot(article_url), METRICS.span('download', article=article_url):
+            response = self.session.get(article_url, headers=headers, timeout=Config.REQUEST_TIMEOUT)
+        if response.status_code == 304 and cached:
+            METRICS.increment('article_cache', result='not_modified')
+            self.cache.touch(article_url)
+            return cached['content']
+        METRICS.increment('article_cache', result='miss')
+        response.raise_for_status()
+        # newspaper analyse la page déjà téléchargée, sans ouvrir sa propre connexion
+        import newspaper
+        with METRICS.span('article_parse', article=article_url):
+            article = newspaper.Article(article_url)
+            # Sans charset dans l'en-tête, requests suppose ISO-8859-1 : newspaper décode alors
+            # les octets lui-même d'après la page (balise meta, détection)
+            declared = 'charset' in response.headers.get('Content-Type', '').lower()
+            article.download(input_html=response.text if declared else response.content)
+            article.parse()
+        content = article.text or ""
+        self.cache.save(
+            article_url,
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified'),
+            content
+        )
+        return content
 
-    def get_articles_from_feed(self, feed_url: str, max_articles: int = Config.MAX_ARTICLES_PER_FEED) -> List[Dict]:
-        try:
-            feed = feedparser.parse(feed_url)
-            if feed.bozo and feed.bozo_exception:
-                logging.warning(f"Flux RSS malformé : {feed_url} - {feed.bozo_exception}")
-            articles = []
-            for entry in feed.entries[:max_articles]:
-                date = entry.get('published', entry.get('updated', entry.get('created', '')))
-                source = entry.get('source', {}).get('title', feed.feed.get('title', 'Source inconnue'))
-                articles.append({
-                    'title': entry.title,
-                    'link': entry.link,
-                    'date': date,
-                    'source': source,
-                    'summary': entry.get('summary', '')
-                })
-            logging.info(f"Récupéré {len(articles)} articles de {feed_url}")
-            return articles
-        except Exception as e:
-            logging.error(f"Erreur lors de la récupération du flux {feed_url} : {e}")
-            return []
+    def close(self):
+        self.cache.close()
 
-    def process_feed(self, feed: Dict) -> List[Dict]:
-        feed_name = feed.get('text', 'Flux sans nom')
-        feed_url = feed.get('xmlUrl')
-        if not feed_url:
-            logging.warning(f"Pas d'URL pour le flux : {feed_name}")
-            return []
-        logging.info(f"Traitement du flux : {feed_name}")
-        articles = self.get_articles_from_feed(feed_url)
-        articles_data = []
-        for article in articles:
-            try:
-                content = self.extractor.extract_article_content(article['link'], fallback_text=article.get('summary', ''))
-                if not content:
-                    logging.info(f"Contenu vide pour l'article : {article['title']}")
-                    continue
-                title = self.translator.translate_to_french(article['title'])
-                if len(content) > 100:
-                    content = self.translator.translate_to_french(content)
-                summary = self.summarizer.summarize_article(content)
-                if summary and len(summary) > 50:
-                    try:
-                        detected_lang = detect(summary)
-                        if detected_lang != 'fr':
-                            summary = self.translator.translate_to_french(summary)
-                    except:
-                        summary = self.translator.translate_to_french(summary)
-                french_date = self.translator.format_date_french(article['date'])
-                articles_data.append({
-                    'title': title,
-                    'date': french_date,
-                    'source': article['source'],
-                    'summary': summary,
-                    'link': article['link']
-                })
-                logging.debug(f"Article traité : {title[:50]}...")
-            except Exception as e:
-                logging.error(f"Erreur lors du traitement de l'article {article.get('title', 'Sans titre')} : {e}")
-                continue
-        logging.info(f"Flux {feed_name} : {len(articles_data)} articles traités avec succès")
-        return articles_data
+# --- Rédacteurs de documents ---
+class DocumentWriter:
+    """Rend la revue d'une catégorie dans un format, à partir des seuls DigestArticle"""
+    extension = ''
+
+    def write(self, category_name: str, articles: List[DigestArticle], path: Path):
+        raise NotImplementedError
+
+class DocxWriter(DocumentWriter):
+    extension = 'docx'
+
+    def write(self, category_name: str, articles: List[DigestArticle], path: Path):
+        self.create_document(category_name, articles).save(str(path))
 
-    def create_document(self, category_name: str, all_articles: List[Dict]) -> Document:
+    def create_document(self, category_name: str, all_articles: List[DigestArticle]) -> "Document":
+        from docx import Document
         doc = Document()
         title = doc.add_heading(f"Revue de presse : {category_name}", level=0)
         self._add_header_footer(doc, category_name)
@@ -454,22 +2330,30 @@ class RSSProcessor:
         stats_para.add_run(f"\nDate de génération : {datetime.now().strftime('%d/%m/%Y à %H:%M')}")
         doc.add_paragraph("")
         for i, article in enumerate(all_articles, 1):
-            heading = doc.add_heading(f"{i}. {article['title']}", level=1)
+            heading = doc.add_heading(f"{i}. {article.title}", level=1)
             meta_para = doc.add_paragraph()
             meta_para.add_run("Date : ").bold = True
-            meta_para.add_run(article['date'])
+            meta_para.add_run(article.display_date)
             meta_para.add_run(" | Source : ").bold = True
-            meta_para.add_run(article['source'])
-            if article.get('link'):
+            meta_para.add_run(article.source)
+            if article.link:
                 meta_para.add_run(" | Lien : ").bold = True
-                meta_para.add_run(article['link'])
+                meta_para.add_run(article.link)
             summary_para = doc.add_paragraph()
             summary_para.add_run("Résumé : ").bold = True
-            summary_para.add_run(article['summary'])
+            summary_para.add_run(article.summary)
+            if article.also_reported_by:
+                also_para = doc.add_paragraph()
+                also_para.add_run("Également rapporté par : ").bold = True
+                also_para.add_run(", ".join(
+                    f"{other['source']} ({other['link']})" for other in article.also_reported_by
+                ))
             doc.add_paragraph("")
         return doc
 
-    def _add_header_footer(self, doc: Document, category_name: str):
+    def _add_header_footer(self, doc: "Document", category_name: str):
+        from docx.shared import Pt
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
         section = doc.sections[0]
         header = section.header
         header_paragraph = header.paragraphs[0] if header.paragraphs else header.add_paragraph()
@@ -486,46 +2370,923 @@ class RSSProcessor:
             footer_paragraph.runs[0].font.size = Pt(10)
             footer_paragraph.runs[0].font.italic = True
 
-    def process_opml(self, opml_file: str):
+class HtmlWriter(DocumentWriter):
+    extension = 'html'
+
+    def write(self, category_name: str, articles: List[DigestArticle], path: Path):
+        e = html.escape
+        parts = [
+            '<!DOCTYPE html>',
+            '<html lang="fr">',
+            f'<head><meta charset="utf-8"><title>Revue de presse : {e(category_name)}</title></head>',
+            '<body>',
+            f'<h1>Revue de presse : {e(category_name)}</h1>',
+            f"<p>Nombre d'articles : {len(articles)}<br>"
+            f"Date de génération : {datetime.now().strftime('%d/%m/%Y à %H:%M')}</p>",
+        ]
+        for i, article in enumerate(articles, 1):
+            meta = f'<strong>Date :</strong> {e(article.display_date)} | <strong>Source :</strong> {e(article.source)}'
+            if article.link:
+                meta += f' | <strong>Lien :</strong> <a href="{e(article.link)}">{e(article.link)}</a>'
+            parts += [
+                '<article>',
+                f'<h2>{i}. {e(article.title)}</h2>',
+                f'<p>{meta}</p>',
+                f'<p><strong>Résumé :</strong> {e(article.summary)}</p>',
+            ]
+            if article.also_reported_by:
+                others = ", ".join(
+                    f'<a href="{e(other["link"])}">{e(other["source"])}</a>' for other in article.also_reported_by
+                )
+                parts.append(f'<p><strong>Également rapporté par :</strong> {others}</p>')
+            parts.append('</article>')
+        parts += ['</body>', '</html>']
+        path.write_text("\n".join(parts) + "\n", encoding='utf-8')
+
+class MarkdownWriter(DocumentWriter):
+    extension = 'md'
+
+    def write(self, category_name: str, articles: List[DigestArticle], path: Path):
+        lines = [
+            f"# Revue de presse : {category_name}",
+            "",
+            f"Nombre d'articles : {len(articles)}  ",
+            f"Date de génération : {datetime.now().strftime('%d/%m/%Y à %H:%M')}",
+        ]
+        for i, article in enumerate(articles, 1):
+            meta = f"**Date :** {article.display_date} | **Source :** {article.source}"
+            if article.link:
+                meta += f" | **Lien :** <{article.link}>"
+            lines += ["", f"## {i}. {article.title}", "", meta, "", f"**Résumé :** {article.summary}"]
+            if article.also_reported_by:
+                lines += ["", "**Également rapporté par :** " + ", ".join(
+                    f"[{other['source']}]({other['link']})" for other in article.also_reported_by
+                )]
+        path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+class JsonlWriter(DocumentWriter):
+    """Un article par ligne, pour les traitements en aval"""
+    extension = 'jsonl'
+
+    def write(self, category_name: str, articles: List[DigestArticle], path: Path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for article in articles:
+                f.write(json.dumps(article.to_dict(), ensure_ascii=False) + "\n")
+
+DOCUMENT_WRITERS = {
+    writer.extension: writer for writer in (DocxWriter, HtmlWriter, MarkdownWriter, JsonlWriter)
+}
+
+# --- Classe RSSProcessor ---
+class RSSProcessor:
+    def __init__(self, summary_profile: str = Config.DEFAULT_SUMMARY_PROFILE,
+                 category_profiles: Optional[Dict[str, str]] = None,
+                 inference_processes: int = Config.INFERENCE_PROCESSES,
+                 summarize_first: bool = Config.SUMMARIZE_FIRST,
+                 dedup: bool = Config.DEDUP_ENABLED,
+                 skip_seen: bool = Config.DEDUP_SKIP_SEEN,
+                 reuse_results: bool = Config.REUSE_RESULTS,
+                 incremental: bool = Config.INCREMENTAL,
+                 output_formats: Optional[List[str]] = None):
+        self.summarize_first = summarize_first
+        self.writers = [DOCUMENT_WRITERS[output_format]() for output_format in output_formats or Config.OUTPUT_FORMATS]
+        self.deduplicator = StoryDeduplicator(skip_seen=skip_seen) if dedup else None
+        self.results = ArticleResultStore()
+        self.reuse_results = reuse_results
+        self.incremental = incremental
+        self.run_id = new_run_id()
+        self.scheduler = DeadlineScheduler()
+        self.translator = TranslationManager()
+        self.summarizer = ArticleSummarizer(summary_profile)
+        self.category_profiles = dict(Config.CATEGORY_SUMMARY_PROFILES, **(category_profiles or {}))
+        self.inference_pool = None
+        if inference_processes > 0:
+            self._start_inference_pool(summary_profile, inference_processes)
+        self.session = create_http_session()
+        self.extractor = ArticleExtractor(self.session)
+        self.feed_state = FeedStateStore()
+
+    def get_articles_from_feed(self, feed_url: str, max_articles: Optional[int] = None) -> List[Dict]:
+        # Lu à l'appel : la configuration peut changer après l'import (benchmark, options)
+        max_articles = max_articles or Config.MAX_ARTICLES_PER_FEED
+        try:
+            state = self.feed_state.get(feed_url)
+            headers = {}
+            if state and state['etag']:
+                headers['If-None-Match'] = state['etag']
+            if state and state['last_modified']:
+                headers['If-Modified-Since'] = state['last_modified']
+            with METRICS.span('fetch', feed=feed_url):
+                # Corps lu à la demande : la lecture s'arrête avec le parsing
+                response = self.session.get(feed_url, headers=headers, timeout=Config.REQUEST_TIMEOUT,
+                                            stream=Config.FEED_STREAMING)
+            try:
+                if response.status_code == 304 and state:
+                    # Flux inchangé : aucun téléchargement ni parsing
+                    METRICS.increment('feed', result='not_modified')
+                    logging.info(f"Flux inchangé (304) : {feed_url}")
+                    return state['articles'][:max_articles]
+                METRICS.increment('feed', result='modified')
+                response.raise_for_status()
+                with METRICS.span('feed_parse', feed=feed_url):
+                    feed_title, entries = self._parse_feed(response, feed_url, max_articles)
+            finally:
+                response.close()
+            articles = []
+            entry_ids = []
+            for entry in entries[:max_articles]:
+                entry_ids.append(entry['id'] or entry['link'])
+                articles.append({
+                    'title': entry['title'],
+                    'link': entry['link'],
+                    'date': entry['date'],
+                    'source': entry['source'] or feed_title or 'Source inconnue',
+                    'summary': entry['summary']
+                })
+            known_ids = set(state['entry_ids']) if state else set()
+            new_count = sum(1 for entry_id in entry_ids if entry_id not in known_ids)
+            self.feed_state.save(
+                feed_url,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'),
+                entry_ids,
+                articles
+            )
+            logging.info(f"Récupéré {len(articles)} articles de {feed_url} ({new_count} nouveaux)")
+            return articles
+        except Exception as e:
+            logging.error(f"Erreur lors de la récupération du flux {feed_url} : {e}")
+            return []
+
+    def _parse_feed(self, response: "requests.Response", feed_url: str,
+                    max_articles: int) -> Tuple[Optional[str], List[Dict]]:
+        received = []
+        exhausted = False
+        if Config.FEED_STREAMING:
+            parser = StreamingFeedParser(max_articles)
+            try:
+                for chunk in response.iter_content(Config.FEED_CHUNK_SIZE):
+                    received.append(chunk)
+                    if parser.feed(chunk):
+                        break
+                else:
+                    # Flux lu jusqu'au bout : il ne peut plus être relu
+                    exhausted = True
+                    parser.close()
+                if parser.recognized:
+                    METRICS.increment('feed_bytes', sum(len(chunk) for chunk in received), parser='stream')
+                    return parser.title, parser.entries
+            except ET.ParseError as e:
+                logging.info(f"Flux non conforme, analyse par feedparser : {feed_url} ({e})")
+        # Flux malformé ou format inconnu : feedparser, sur le document complet
+        body = b''.join(received)
+        if not exhausted:
+            body += b''.join(response.iter_content(Config.FEED_CHUNK_SIZE))
+        METRICS.increment('feed_bytes', len(body), parser='feedparser')
+        return self._parse_feed_with_feedparser(body, response.headers, feed_url, max_articles)
+
+    @staticmethod
+    def _parse_feed_with_feedparser(body: bytes, headers, feed_url: str,
+                                    max_articles: int) -> Tuple[Optional[str], List[Dict]]:
+        import feedparser
+        feed = feedparser.parse(body, response_headers=dict(headers))
+        if feed.bozo and feed.bozo_exception:
+            logging.warning(f"Flux RSS malformé : {feed_url} - {feed.bozo_exception}")
+        entries = []
+        for entry in feed.entries[:max_articles]:
+            entries.append({
+                'id': entry.get('id', entry.link),
+                'title': entry.title,
+                'link': entry.link,
+                'date': entry.get('published', entry.get('updated', entry.get('created', ''))),
+                'source': entry.get('source', {}).get('title', ''),
+                'summary': entry.get('summary', ''),
+            })
+        return feed.feed.get('title'), entries
+
+    def process_feed(self, feed: Dict, category: Optional[str] = None,
+                     deadline: Optional[Deadline] = None) -> List[DigestArticle]:
+        deadline = deadline or Deadline()
+        feed_name = feed.get('text', 'Flux sans nom')
+        feed_url = feed.get('xmlUrl')
+        if not feed_url:
+            logging.warning(f"Pas d'URL pour le flux : {feed_name}")
+            return []
+        logging.info(f"Traitement du flux : {feed_name}")
+        articles = self.get_articles_from_feed(feed_url)
+        articles_data = []
+        for article in articles:
+            # Annulation coopérative : aucun nouvel article une fois le budget de la catégorie épuisé
+            if deadline.expired():
+                METRICS.increment('deadline_exceeded', stage='feed')
+                logging.warning(f"Budget épuisé : articles restants du flux {feed_name} abandonnés")
+                break
+            try:
+                item = self._extract_article(self._with_deadlines(dict(article, feed=feed_url), category, deadline))
+                if item is None:
+                    continue
+                self._analyze_article(item)
+                if self._deduplicate_article(item) is None:
+                    continue
+                article_data = self._complete_article(item)
+                if article_data is None:
+                    continue
+                articles_data.append(article_data)
+                logging.debug(f"Article traité : {article_data.title[:50]}...")
+            except Exception as e:
+                logging.error(f"Erreur lors du traitement de l'article {article.get('title', 'Sans titre')} : {e}")
+                continue
+        logging.info(f"Flux {feed_name} : {len(articles_data)} articles traités avec succès")
+        return articles_data
+
+    def _complete_article(self, item: Dict) -> Optional[DigestArticle]:
+        # Étapes qui suivent la détection des reprises
+        if self._lookup_result(item) is None:
+            return None
+        self._translate_article(item)
+        self._summarize_article(item)
+        self._translate_article(item)
+        return self._assemble_article(item)
+
+    # Étapes du traitement d'un article, partagées par process_feed et AsyncPipeline
+
+    def _with_deadlines(self, article: Dict, category: Optional[str], budget: Deadline) -> Dict:
+        # budget : échéance de la catégorie (ou de l'exécution en mode pipeline), qui règle la dégradation
+        return dict(article, category=category, budget=budget,
+                    deadline=self.scheduler.article_deadline(budget))
+
+    @staticmethod
+    def _time_left(item: Dict) -> Optional[float]:
+        deadline = item.get('deadline')
+        return deadline.remaining() if deadline is not None else None
+
+    def _extract_article(self, article: Dict) -> Optional[Dict]:
+        with METRICS.span('extract', article=article['link']):
+            content = self.extractor.extract_article_content(article['link'], fallback_text=article.get('summary', ''))
+        if not content:
+            logging.info(f"Contenu vide pour l'article : {article['title']}")
+            return None
+        return dict(article, content=content)
+
+    def _deduplicate_article(self, item: Dict) -> Optional[Dict]:
+        if self.deduplicator is None:
+            return item
+        with METRICS.span('dedup', article=item['link']) as record:
+            result = self.deduplicator.check(item)
+            record['outcome'] = result
+        METRICS.increment('dedup', result=result)
+        if result == StoryDeduplicator.DUPLICATE:
+            logging.info(f"Reprise d'un article déjà retenu : {item['title'][:50]} ({item['source']})")
+            return None
+        if result == StoryDeduplicator.SEEN:
+            logging.info(f"Article déjà couvert par une revue précédente : {item['title'][:50]}")
+            return None
+        return item
+
+    def _lookup_result(self, item: Dict) -> Optional[Dict]:
+        # Résultat déjà calculé pour ce texte : reprise après interruption, ou article écarté en mode incrémental
+        if 'canonical_url' not in item:
+            item['canonical_url'] = canonicalize_url(item['link'])
+        item['content_hash'] = ArticleResultStore.content_hash(item['analysis'].text)
+        if not (self.reuse_results or self.incremental):
+            return item
+        stored = self.results.get(item['canonical_url'], item['content_hash'])
+        if stored is None:
+            return item
+        if not stored.complete:
+            # Résumé dégradé ou traduction manquée : refait quand le budget et les services le permettent,
+            # y compris en mode incrémental
+            METRICS.increment('stored_result', result='retried')
+            return item
+        if self.incremental:
+            METRICS.increment('stored_result', result='skipped')
+            logging.info(f"Article déjà traité (mode incrémental) : {item['title'][:50]}")
+            if self.deduplicator is not None and 'story_id' in item:
+                self.deduplicator.settle(item['story_id'])
+            return None
+        METRICS.increment('stored_result', result='reused')
+        item['stored'] = stored
+        return item
+
+    def _analyze_article(self, item: Dict) -> Dict:
+        # Texte normalisé, langue, phrases et tokens : calculés une fois, lus par les étapes suivantes
+        with METRICS.span('analyze', article=item['link']):
+            analysis = TextAnalysis(item['content'])
+            item['language'] = analysis.detect()
+        item['analysis'] = analysis
+        # Décidé sur le texte original : la traduction, plus courte, pourrait changer le profil
+        item['summarize_first'] = self._uses_summarize_first(item)
+        return item
+
+    def _uses_summarize_first(self, item: Dict) -> bool:
+        if not self.summarize_first:
+            return False
+        if item.get('language') in Config.SUMMARIZE_FIRST_LANGUAGES:
+            return True
+        # Un moteur indépendant de la langue résume le texte original, quelle qu'en soit la langue
+        profile = self.summarizer.resolve_profile(item['analysis'], self.category_profiles.get(item.get('category')))
+        return summarizer_engine(profile).multilingual
+
+    def _translate_article(self, item: Dict) -> Dict:
+        return self._finish_translation(self._start_translation(item))
+
+    def _translation_request(self, item: Dict) -> Tuple[List[str], List[Union[str, TextAnalysis]], Optional[str]]:
+        """Champs à traduire avant le résumé (titre et texte) ou après (titre et résumé), et leur langue"""
+        analysis = item['analysis']
+        # summary_level n'existe qu'une fois le résumé fait (summary peut venir du flux)
+        if 'summary_level' not in item:
+            if item['summarize_first']:
+                # Traduction reportée après le résumé, sur le titre et le résumé seulement
+                return [], [], None
+            if len(analysis.text) > 100:
+                return ['title', 'content'], [item['title'], analysis], item.get('language')
+            return ['title'], [item['title']], item.get('language')
+        summary = item['summary']
+        if item['summarize_first']:
+            return ['title', 'summary'], [item['title'], summary], item.get('language')
+        if summary and len(summary) > 50 and analysis.language != 'fr':
+            # Le résumé est dans la langue du texte résumé : pas de nouvelle détection
+            return ['summary'], [summary], analysis.language
+        return [], [], None
+
+    def _start_translation(self, item: Dict) -> Dict:
+        # Cache et modèle local : étape d'inférence, séparée de l'attente des services externes
+        if 'stored' in item:
+            return item
+        fields, texts, language = self._translation_request(item)
+        if not fields:
+            return item
+        with METRICS.span('translate', article=item['link'], tier='local'):
+            item['translation'] = (fields, self.translator.translate_local(
+                texts, src_langs=[language] * len(texts), timeout=self._time_left(item)
+            ))
+        return item
+
+    def _finish_translation(self, item: Dict) -> Dict:
+        # Services externes pour les textes restants, puis report des traductions dans l'article
+        if 'translation' not in item:
+            return item
+        fields, batch = item.pop('translation')
+        if batch.remote:
+            with METRICS.span('translate', article=item['link'], tier='remote'):
+                self.translator.translate_remote(batch)
+        # Champs restés dans leur langue ; un texte non traduit est rattrapé par la traduction du résumé
+        untranslated = item.setdefault('untranslated', set())
+        for index, field in enumerate(fields):
+            if index in batch.untranslated:
+                untranslated.add(field)
+            else:
+                untranslated.discard(field)
+        for field, translated in zip(fields, batch.results):
+            if field == 'content':
+                if translated != item['analysis'].text:
+                    item['content'] = translated
+                    item['analysis'] = TextAnalysis(translated, language='fr')
+            else:
+                item[field] = translated
+        return item
+
+    def _summarize_article(self, item: Dict) -> Dict:
+        if 'stored' in item:
+            return item
+        profile = self.category_profiles.get(item.get('category'))
+        analysis = item['analysis']
+        level = self.scheduler.level(item.get('budget'))
+        with METRICS.span('summarize', article=item['link'], level=level):
+            summary, level = self.summarizer.summarize_article(analysis, profile, level,
+                                                               self._time_left(item))
+        if level:
+            METRICS.increment('summary_degraded', level=level)
+        item['summary_level'] = level
+        # Traduit ensuite par _translate_article, hors de l'étape d'inférence du résumé
+        item['summary'] = summary
+        return item
+
+    def _assemble_article(self, item: Dict) -> DigestArticle:
+        with METRICS.span('assemble', article=item['link']):
+            if 'stored' in item:
+                article = item['stored']
+                # Les autres sources sont celles de cette exécution
+                article.also_reported_by = []
+            else:
+                article = DigestArticle(
+                    title=item['title'],
+                    link=item['link'],
+                    date=item['date'],
+                    source=item['source'],
+                    summary=item['summary'],
+                    canonical_url=item['canonical_url'],
+                    content_hash=item['content_hash'],
+                    summary_level=item.get('summary_level', DeadlineScheduler.FULL),
+                    # Résultat provisoire : ni réutilisé, ni marqué comme couvert (voir DigestArticle.complete)
+                    untranslated=bool(item.get('untranslated', set()) & {'title', 'summary'}),
+                )
+            article.category = item.get('category')
+            article.feed = item.get('feed')
+            if self.deduplicator is not None:
+                article.story_id = item['story_id']
+            if 'stored' not in item:
+                # Conservé dès maintenant : une exécution interrompue reprend sans recalcul
+                self.results.save(article, self.run_id)
+            return article
+
+    def _load_categories(self, opml_file: str) -> List[Tuple[str, List[Dict]]]:
+        with open(opml_file, 'r', encoding='utf-8') as f:
+            opml_content = f.read()
+        root = ET.ElementTree(ET.fromstring(opml_content)).getroot()
+        return [
+            (category.get('text', 'Catégorie'), [dict(feed.attrib) for feed in category.findall('outline')])
+            for category in root.findall('body/outline')
+        ]
+
+    def _promote_duplicates(self, articles_by_category: Dict[str, List[DigestArticle]]):
+        # Article principal en échec ou abandonné à l'échéance : une de ses reprises prend sa place
+        assembled = {article.story_id for articles in articles_by_category.values() for article in articles}
+        for story_id, duplicates in self.deduplicator.orphans(assembled).items():
+            for duplicate in duplicates:
+                item = self._with_deadlines(duplicate, duplicate.get('category'), duplicate['budget'])
+                self.deduplicator.promote(item)
+                try:
+                    article = self._complete_article(item)
+                except Exception as e:
+                    logging.error(f"Erreur lors du traitement de la reprise {item['title'][:50]} : {e}")
+                    continue
+                if article is not None:
+                    METRICS.increment('dedup', result='promoted')
+                    logging.info(f"Reprise retenue à la place de l'article principal : {item['title'][:50]} ({item['source']})")
+                    articles_by_category.setdefault(article.category, []).append(article)
+                break
+            else:
+                self.deduplicator.forget(story_id)
+
+    def _publish_categories(self, articles_by_category: Dict[str, List[DigestArticle]], timestamp: str):
+        if self.deduplicator is not None:
+            self._promote_duplicates(articles_by_category)
+        digests = {}
+        for category_name, all_articles in articles_by_category.items():
+            if self.deduplicator is not None:
+                for article in all_articles:
+                    article.also_reported_by = self.deduplicator.also_reported_by(article.story_id)
+            digests[category_name] = latest_first(all_articles, Config.MAX_ARTICLES_PER_DIGEST)
+        failed = self._render_documents(digests, timestamp)
+        for category_name, articles in digests.items():
+            if category_name in failed:
+                continue
+            # La revue est écrite : ses articles sont rattachés à cette exécution et marqués comme couverts,
+            # sauf les résumés dégradés ou non traduits, repris à la prochaine exécution
+            self.results.attach(articles, self.run_id)
+            if self.deduplicator is not None:
+                self.deduplicator.publish([article.story_id for article in articles if article.complete])
+
+    def _render_documents(self, digests: Dict[str, List[DigestArticle]], timestamp: str) -> set:
+        """Écrit chaque revue dans chaque format, en parallèle ; renvoie les catégories en échec"""
+        failed = set()
+        with ThreadPoolExecutor(max_workers=Config.RENDER_WORKERS, thread_name_prefix="render") as executor:
+            future_to_document = {}
+            for category_name, articles in digests.items():
+                Path(category_name).mkdir(exist_ok=True)
+                if not articles:
+                    logging.warning(f"Aucun article récupéré pour la catégorie '{category_name}'")
+                    continue
+                for writer in self.writers:
+                    future = executor.submit(self._write_document, writer, category_name, articles, timestamp)
+                    future_to_document[future] = (category_name, writer.extension)
+            for future in as_completed(future_to_document):
+                category_name, extension = future_to_document[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    failed.add(category_name)
+                    logging.error(f"Erreur lors de l'écriture de la revue '{category_name}' ({extension}) : {e}")
+        return failed
+
+    @staticmethod
+    def _write_document(writer: DocumentWriter, category_name: str, articles: List[DigestArticle], timestamp: str):
+        doc_file = Path(category_name) / f"{category_name}_{timestamp}.{writer.extension}"
+        with METRICS.span('document', category=category_name, format=writer.extension):
+            writer.write(category_name, articles, doc_file)
+        logging.info(f"Document créé : {doc_file} ({len(articles)} articles)")
+
+    def process_opml(self, opml_file: str, pipelined: bool = Config.PIPELINE_MODE,
+                     categories_filter: Optional[List[str]] = None,
+                     run_budget: Optional[float] = Config.RUN_BUDGET):
         opml_path = Path(opml_file)
         if not opml_path.exists():
             logging.error(f"Fichier OPML non trouvé : {opml_file}")
             return
+        METRICS.reset()
+        self.run_id = new_run_id()
+        self.scheduler.start_run(run_budget)
+        self.results.prune()
+        if self.deduplicator is not None:
+            self.deduplicator.start_run(self.run_id)
         try:
-            with open(opml_path, 'r', encoding='utf-8') as f:
-                opml_content = f.read()
-            root = ET.ElementTree(ET.fromstring(opml_content)).getroot()
-            for category in root.findall('body/outline'):
-                category_name = category.get('text', 'Catégorie')
-                category_path = Path(category_name)
-                category_path.mkdir(exist_ok=True)
+            categories = self._load_categories(opml_path)
+            if categories_filter:
+                categories = [(name, feeds) for name, feeds in categories if name in categories_filter]
+            if pipelined:
+                timestamp = datetime.now().strftime("%Y%m%d_%Hh%M")
+                results = asyncio.run(AsyncPipeline(self, deadline=self.scheduler.run).run(categories))
+                self._publish_categories(results, timestamp)
+                return
+            for index, (category_name, rss_feeds) in enumerate(categories):
                 timestamp = datetime.now().strftime("%Y%m%d_%Hh%M")
-                rss_feeds = list(category.findall('outline'))
                 logging.info(f"Traitement de {len(rss_feeds)} flux pour '{category_name}'")
-                all_articles = []
-                with ThreadPoolExecutor(max_workers=Config.MAX_WORKERS) as executor:
-                    future_to_feed = {executor.submit(self.process_feed, feed): feed for feed in rss_feeds}
-                    for future in tqdm(as_completed(future_to_feed), total=len(rss_feeds), desc=f"{category_name}"):
-                        try:
-                            articles = future.result(timeout=30)
-                            all_articles.extend(articles)
-                        except Exception as e:
-                            feed = future_to_feed[future]
-                            logging.error(f"Erreur pour le flux {feed.get('text', 'inconnu')} : {e}")
-                if all_articles:
-                    all_articles.sort(key=lambda x: x.get('date', ''), reverse=True)
-                    doc = self.create_document(category_name, all_articles)
-                    doc_file = category_path / f"{category_name}_{timestamp}.docx"
-                    doc.save(str(doc_file))
-                    logging.info(f"Document créé : {doc_file} ({len(all_articles)} articles)")
-                else:
-                    logging.warning(f"Aucun article récupéré pour la catégorie '{category_name}'")
+                deadline = self.scheduler.category_deadline(len(categories) - index)
+                all_articles = self._process_category_feeds(category_name, rss_feeds, deadline)
+                self._publish_categories({category_name: all_articles}, timestamp)
         except Exception as e:
             logging.error(f"Erreur lors du traitement du fichier OPML : {e}")
             raise
 
-# --- Fonction principale avec interface Tkinter ---
-def main():
+    def _process_category_feeds(self, category_name: str, rss_feeds: List[Dict],
+                                deadline: Deadline) -> List[DigestArticle]:
+        all_articles = []
+        executor = ThreadPoolExecutor(max_workers=Config.MAX_WORKERS)
+        future_to_feed = {executor.submit(self.process_feed, feed, category_name, deadline): feed for feed in rss_feeds}
+        remaining = deadline.remaining()
+        timeout = None if remaining is None else remaining + Config.DEADLINE_GRACE
+        try:
+            for future in tqdm(as_completed(future_to_feed, timeout=timeout), total=len(rss_feeds), desc=f"{category_name}"):
+                try:
+                    all_articles.extend(future.result())
+                except Exception as e:
+                    feed = future_to_feed[future]
+                    logging.error(f"Erreur pour le flux {feed.get('text', 'inconnu')} : {e}")
+        except FuturesTimeoutError:
+            # Les flux pas encore commencés sont annulés ; ceux en cours s'arrêtent à l'article suivant
+            unfinished = [future for future in future_to_feed if not future.done()]
+            for future in unfinished:
+                future.cancel()
+            METRICS.increment('deadline_exceeded', len(unfinished), stage='category')
+            logging.warning(f"Budget de la catégorie '{category_name}' épuisé : {len(unfinished)} flux abandonnés")
+        finally:
+            executor.shutdown(wait=False)
+        return all_articles
+
+    def rebuild_documents(self, run_id: Optional[str] = None, categories_filter: Optional[List[str]] = None):
+        """Réécrit les revues d'une exécution (la dernière par défaut) à partir des seuls articles conservés"""
+        run_id = run_id or self.results.latest_run()
+        if run_id is None:
+            logging.warning("Aucun article conservé : rien à reconstruire")
+            return
+        timestamp = datetime.now().strftime("%Y%m%d_%Hh%M")
+        self._render_documents({
+            category_name: latest_first(articles, Config.MAX_ARTICLES_PER_DIGEST)
+            for category_name, articles in self.results.load_run(run_id).items()
+            if not categories_filter or category_name in categories_filter
+        }, timestamp)
+
+    def _start_inference_pool(self, summary_profile: str, processes: int):
+        profiles = sorted({summary_profile, *self.category_profiles.values()})
+        pool = InferenceProcessPool(self.summarizer, self.translator, processes, profiles)
+        if not pool.start():
+            return
+        self.inference_pool = pool
+        self.summarizer.inference_pool = pool
+        self.translator.inference_pool = pool
+        # Un lot en vol par processus
+        self.summarizer._queue.add_workers(processes - 1)
+        self.translator._local_queue.add_workers(processes - 1)
+
+    @property
+    def inference_parallelism(self) -> int:
+        return self.inference_pool.processes if self.inference_pool else 1
+
+    def warm_up(self):
+        # Charge les modèles immédiatement, pour un processus qui reste résident
+        self.summarizer.ensure_model()
+        self.translator._get_local_translator('en')
+
+    def close(self):
+        if self.inference_pool:
+            self.inference_pool.close()
+        self.translator.close()
+        self.extractor.close()
+        self.feed_state.close()
+        self.results.close()
+        if self.deduplicator is not None:
+            self.deduplicator.close()
+
+# --- Classe AsyncPipeline ---
+class AsyncPipeline:
+    """Pipeline par étapes reliées par des files bornées, toutes catégories confondues"""
+
+    # Marqueur de fin envoyé à chaque worker de l'étape suivante
+    _STOP = object()
+
+    def __init__(self, processor: RSSProcessor, queue_size: int = Config.PIPELINE_QUEUE_SIZE,
+                 deadline: Optional[Deadline] = None):
+        self.processor = processor
+        self.queue_size = queue_size
+        # Une seule échéance pour toutes les catégories, qui avancent ensemble
+        self.deadline = deadline or Deadline()
+        # Réseau (flux, pages, services de traduction) et inférence (BART) ont
+        # chacun leur exécuteur, pour que l'attente de l'un recouvre le calcul de l'autre
+        self.io_executor = ThreadPoolExecutor(
+            max_workers=Config.PIPELINE_IO_WORKERS, thread_name_prefix="pipeline-io"
+        )
+        self.model_workers = Config.SUMMARY_BATCH_SIZE * processor.inference_parallelism
+        self.model_executor = ThreadPoolExecutor(
+            max_workers=self.model_workers, thread_name_prefix="pipeline-model"
+        )
+
+    def _stages(self) -> List[Tuple[str, Callable[[Dict], List[Dict]], ThreadPoolExecutor, int]]:
+        p = self.processor
+        return [
+            ("fetch", self._fetch_feed, self.io_executor, Config.PIPELINE_IO_WORKERS),
+            ("extract", self._extract, self.io_executor, Config.PIPELINE_IO_WORKERS),
+            ("analyze", lambda item: [p._analyze_article(item)], self.model_executor, 1),
+            # Index des reprises et résultats conservés : SQLite, hors de la boucle d'événements
+            ("dedup", lambda item: self._one(p._deduplicate_article(item)), self.io_executor, 1),
+            ("lookup", lambda item: self._one(p._lookup_result(item)), self.io_executor, 1),
+            # Modèle local sur l'exécuteur d'inférence, services externes sur celui du réseau
+            ("translate", lambda item: [p._start_translation(item)], self.model_executor, self.model_workers),
+            ("translate_remote", lambda item: [p._finish_translation(item)], self.io_executor, Config.PIPELINE_IO_WORKERS),
+            ("summarize", lambda item: [p._summarize_article(item)], self.model_executor, self.model_workers),
+            ("translate_summary", lambda item: [p._start_translation(item)], self.model_executor, self.model_workers),
+            ("translate_summary_remote", lambda item: [p._finish_translation(item)], self.io_executor,
+             Config.PIPELINE_IO_WORKERS),
+            ("assemble", lambda item: [p._assemble_article(item)], self.io_executor, 1),
+        ]
+
+    @staticmethod
+    def _one(item: Optional[Dict]) -> List[Dict]:
+        return [item] if item is not None else []
+
+    def _fetch_feed(self, feed: Dict) -> List[Dict]:
+        feed_url = feed.get('xmlUrl')
+        if not feed_url:
+            logging.warning(f"Pas d'URL pour le flux : {feed.get('text', 'Flux sans nom')}")
+            return []
+        if self.deadline.expired():
+            METRICS.increment('deadline_exceeded', stage='feed')
+            return []
+        articles = self.processor.get_articles_from_feed(feed_url)
+        # Pas de budget par article : l'attente dans les files ne doit pas compter
+        # contre l'article, seule l'échéance de l'exécution s'applique
+        return [dict(article, category=feed['category'], feed=feed_url, budget=self.deadline, deadline=self.deadline)
+                for article in articles]
+
+    def _extract(self, item: Dict) -> List[Dict]:
+        # Passé l'échéance, les articles pas encore téléchargés sont abandonnés
+        if self.deadline.expired():
+            METRICS.increment('deadline_exceeded', stage='extract')
+            return []
+        return self._one(self.processor._extract_article(item))
+
+    async def _worker(self, name: str, fn: Callable, executor: ThreadPoolExecutor,
+                      inbox: asyncio.Queue, outbox: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await inbox.get()
+            if item is self._STOP:
+                return
+            try:
+                outputs = await loop.run_in_executor(executor, fn, item)
+            except Exception as e:
+                logging.error(f"Erreur à l'étape {name} pour {item.get('title', item.get('text', 'inconnu'))} : {e}")
+                continue
+            for output in outputs:
+                await outbox.put(output)
+
+    async def _run_stage(self, name: str, fn: Callable, executor: ThreadPoolExecutor,
+                         workers: int, inbox: asyncio.Queue, outbox: asyncio.Queue, next_workers: int):
+        await asyncio.gather(*(
+            self._worker(name, fn, executor, inbox, outbox) for _ in range(workers)
+        ))
+        for _ in range(next_workers):
+            await outbox.put(self._STOP)
+
+    async def _collect(self, inbox: asyncio.Queue, results: Dict[str, List[DigestArticle]]):
+        with tqdm(desc="Pipeline", unit="article") as progress:
+            while True:
+                item = await inbox.get()
+                if item is self._STOP:
+                    return
+                results[item.category].append(item)
+                progress.update(1)
+
+    async def run(self, categories: List[Tuple[str, List[Dict]]]) -> Dict[str, List[DigestArticle]]:
+        stages = self._stages()
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(len(stages) + 1)]
+        results = {category_name: [] for category_name, _ in categories}
+        feed_count = sum(len(feeds) for _, feeds in categories)
+        logging.info(f"Pipeline : {feed_count} flux répartis sur {len(categories)} catégories")
+
+        async def feed_source():
+            for category_name, feeds in categories:
+                for feed in feeds:
+                    await queues[0].put(dict(feed, category=category_name))
+            for _ in range(stages[0][3]):
+                await queues[0].put(self._STOP)
+
+        tasks = [feed_source()]
+        for i, (name, fn, executor, workers) in enumerate(stages):
+            next_workers = stages[i + 1][3] if i + 1 < len(stages) else 1
+            tasks.append(self._run_stage(name, fn, executor, workers, queues[i], queues[i + 1], next_workers))
+        tasks.append(self._collect(queues[-1], results))
+        remaining = self.deadline.remaining()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*tasks),
+                None if remaining is None else remaining + Config.DEADLINE_GRACE
+            )
+        except asyncio.TimeoutError:
+            # Les articles déjà assemblés sont conservés dans results
+            METRICS.increment('deadline_exceeded', stage='pipeline')
+            logging.warning("Budget de l'exécution épuisé : pipeline interrompu")
+        finally:
+            self.io_executor.shutdown(wait=False)
+            self.model_executor.shutdown(wait=False)
+        return results
+
+# --- Benchmark des profils de résumé ---
+def current_rss_mb() -> Optional[float]:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def serialized_model_mb(backend: SummarizerBackend) -> Optional[float]:
+    model = getattr(backend, 'model', None)
+    if model is None:
+        return None
+    import io
+    import torch
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 2**20
+
+def rouge_scores(candidate: str, reference: str) -> Dict[str, float]:
+    """ROUGE-1, ROUGE-2 et ROUGE-L (F1) sur les mots, sans dépendance externe"""
+    cand = re.findall(r'\w+', candidate.lower())
+    ref = re.findall(r'\w+', reference.lower())
+
+    def f1(overlap: int, cand_total: int, ref_total: int) -> float:
+        if not overlap or not cand_total or not ref_total:
+            return 0.0
+        precision, recall = overlap / cand_total, overlap / ref_total
+        return 2 * precision * recall / (precision + recall)
+
+    scores = {}
+    for n in (1, 2):
+        cand_ngrams = Counter(zip(*(cand[i:] for i in range(n))))
+        ref_ngrams = Counter(zip(*(ref[i:] for i in range(n))))
+        overlap = sum((cand_ngrams & ref_ngrams).values())
+        scores[f'rouge{n}'] = f1(overlap, sum(cand_ngrams.values()), sum(ref_ngrams.values()))
+    # Plus longue sous-séquence commune, en programmation dynamique sur une ligne
+    previous = [0] * (len(ref) + 1)
+    for word in cand:
+        current = [0]
+        for j, ref_word in enumerate(ref):
+            current.append(previous[j] + 1 if word == ref_word else max(previous[j + 1], current[j]))
+        previous = current
+    scores['rougeL'] = f1(previous[-1], len(cand), len(ref))
+    return scores
+
+def benchmark_summarizer_profiles(profiles: List[str], articles: List[str],
+                                  baseline: str = Config.DEFAULT_SUMMARY_PROFILE) -> List[Dict]:
+    summarizer = ArticleSummarizer(baseline)
+    baseline_summaries = None
+    reports = []
+    # Le profil de référence passe en premier : les autres lui sont comparés
+    for profile in [baseline] + [p for p in profiles if p != baseline]:
+        rss_before = current_rss_mb()
+        start = time.perf_counter()
+        backend = summarizer.get_backend(profile)
+        load_seconds = time.perf_counter() - start
+        rss_after = current_rss_mb()
+        latencies = []
+        summaries = []
+        for article in articles:
+            start = time.perf_counter()
+            summaries.append(summarizer.summarize_batch([article], profile)[0])
+            latencies.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        summarizer.summarize_batch(articles, profile)
+        batch_seconds = time.perf_counter() - start
+        if baseline_summaries is None:
+            baseline_summaries = summaries
+        overlaps = [rouge_scores(summary, reference) for summary, reference in zip(summaries, baseline_summaries)]
+        reports.append({
+            'profile': profile,
+            'load_seconds': load_seconds,
+            'latency_mean': sum(latencies) / len(latencies) if latencies else 0.0,
+            'latency_p50': percentile(latencies, 50),
+            'latency_p95': percentile(latencies, 95),
+            'batch_seconds': batch_seconds,
+            'rss_delta_mb': rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+            'model_mb': serialized_model_mb(backend),
+            **{key: sum(o[key] for o in overlaps) / len(overlaps) if overlaps else 0.0
+               for key in ('rouge1', 'rouge2', 'rougeL')},
+        })
+        # Chaque profil est libéré avant le suivant pour mesurer son empreinte seul
+        if profile != baseline:
+            summarizer.backends.pop(profile, None)
+        gc.collect()
+    return reports
+
+def print_summarizer_benchmark(reports: List[Dict]):
+    print(f"{'profil':<12}{'charg.(s)':>10}{'p50(s)':>9}{'p95(s)':>9}{'lot(s)':>9}"
+          f"{'RSS(Mo)':>9}{'modèle(Mo)':>12}{'R-1':>7}{'R-2':>7}{'R-L':>7}")
+    for r in reports:
+        rss = f"{r['rss_delta_mb']:.0f}" if r['rss_delta_mb'] is not None else "?"
+        model_mb = f"{r['model_mb']:.0f}" if r['model_mb'] is not None else "?"
+        print(f"{r['profile']:<12}{r['load_seconds']:>10.1f}{r['latency_p50']:>9.2f}{r['latency_p95']:>9.2f}"
+              f"{r['batch_seconds']:>9.2f}{rss:>9}{model_mb:>12}"
+              f"{r['rouge1']:>7.2f}{r['rouge2']:>7.2f}{r['rougeL']:>7.2f}")
+
+# --- Classe SpoolDaemon ---
+class SpoolDaemon:
+    """Processus résident : les modèles sont chargés une fois, les travaux arrivent par un répertoire"""
+
+    def __init__(self, spool_dir: str = Config.SPOOL_DIR, poll_interval: float = Config.DAEMON_POLL_INTERVAL,
+                 processor: Optional[RSSProcessor] = None):
+        self.spool_dir = Path(spool_dir)
+        self.poll_interval = poll_interval
+        for subdir in ('processing', 'done', 'failed'):
+            (self.spool_dir / subdir).mkdir(parents=True, exist_ok=True)
+        self.processor = processor or RSSProcessor()
+        self.metrics_json = None
+        self.metrics_prom = None
+
+    @staticmethod
+    def submit(spool_dir: str, opml_file: str, categories: Optional[List[str]] = None,
+               pipelined: bool = Config.PIPELINE_MODE, profile_output: Optional[str] = None,
+               run_budget: Optional[float] = None) -> Path:
+        spool_path = Path(spool_dir)
+        spool_path.mkdir(parents=True, exist_ok=True)
+        job = {
+            'opml': str(Path(opml_file).resolve()),
+            'categories': categories or [],
+            'pipelined': pipelined,
+            'profile_output': str(Path(profile_output).resolve()) if profile_output else None,
+            'submitted_at': datetime.now().isoformat(),
+            # Échéance absolue : le temps passé dans la file est décompté du budget
+            'deadline_at': time.time() + run_budget if run_budget is not None else None,
+        }
+        job_name = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.json"
+        # Écriture puis renommage : le démon ne voit jamais un fichier à moitié écrit
+        tmp_file = spool_path / f".{job_name}.tmp"
+        tmp_file.write_text(json.dumps(job, ensure_ascii=False), encoding='utf-8')
+        job_file = spool_path / job_name
+        tmp_file.replace(job_file)
+        return job_file
+
+    def run_once(self) -> int:
+        handled = 0
+        for job_file in sorted(self.spool_dir.glob('*.json')):
+            processing_file = self.spool_dir / 'processing' / job_file.name
+            try:
+                job_file.replace(processing_file)
+            except OSError:
+                continue  # Déjà pris par une autre instance
+            handled += 1
+            try:
+                job = json.loads(processing_file.read_text(encoding='utf-8'))
+                logging.info(f"Démon : travail {job_file.name} ({job['opml']})")
+                # process_opml se contente de journaliser un fichier absent : le travail doit échouer
+                if not Path(job['opml']).exists():
+                    raise FileNotFoundError(f"Fichier OPML non trouvé : {job['opml']}")
+                deadline_at = job.get('deadline_at')
+                with run_profiler(job.get('profile_output')):
+                    self.processor.process_opml(
+                        job['opml'],
+                        pipelined=job.get('pipelined', Config.PIPELINE_MODE),
+                        categories_filter=job.get('categories') or None,
+                        run_budget=deadline_at - time.time() if deadline_at is not None else Config.RUN_BUDGET
+                    )
+                export_metrics(self.metrics_json, self.metrics_prom)
+                processing_file.replace(self.spool_dir / 'done' / job_file.name)
+            except Exception as e:
+                logging.error(f"Démon : échec du travail {job_file.name} : {e}")
+                processing_file.replace(self.spool_dir / 'failed' / job_file.name)
+        return handled
+
+    def serve_forever(self, warm: bool = True):
+        logging.info(f"Démon démarré, répertoire de travaux : {self.spool_dir.resolve()}")
+        if warm:
+            self.processor.warm_up()
+        try:
+            while True:
+                if not self.run_once():
+                    time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            logging.info("Arrêt du démon")
+        finally:
+            self.processor.close()
+
+# --- Interface Tkinter ---
+def run_gui():
+    from tkinter import Tk, messagebox
+    from tkinter.filedialog import askopenfilename
     try:
         Tk().withdraw()
         opml_file = askopenfilename(
@@ -536,11 +3297,182 @@ def main():
             messagebox.showinfo("Annulé", "Aucun fichier sélectionné. Le programme va se fermer.")
             return
         processor = RSSProcessor()
-        processor.process_opml(opml_file)
+        try:
+            processor.process_opml(opml_file)
+        finally:
+            processor.close()
         messagebox.showinfo("Terminé", "Traitement terminé ! Les documents Word sont créés.")
     except Exception as e:
         messagebox.showerror("Erreur", f"Erreur fatale : {e}")
         logging.error(f"Erreur fatale : {e}")
 
+# --- Ligne de commande ---
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Revue de presse automatique à partir d'un fichier OPML")
+    subparsers = parser.add_subparsers(dest='command')
+
+    subparsers.add_parser('gui', help="Sélection du fichier OPML via Tkinter (par défaut)")
+
+    run_parser = subparsers.add_parser('run', help="Traitement sans interface graphique")
+    run_parser.add_argument('opml', help="Fichier OPML à traiter")
+    run_parser.add_argument('-c', '--category', action='append', dest='categories',
+                            help="Catégorie à traiter (option répétable, toutes par défaut)")
+    run_parser.add_argument('--pipeline', action='store_true', default=Config.PIPELINE_MODE,
+                            help="Toutes les catégories traversent ensemble le pipeline asynchrone")
+    add_summary_arguments(run_parser)
+    add_metrics_arguments(run_parser)
+    add_budget_arguments(run_parser)
+    add_output_arguments(run_parser)
+    run_parser.add_argument('--profile-run', metavar='FICHIER',
+                            help="Profile l'exécution (pyinstrument si installé, sinon cProfile)")
+
+    daemon_parser = subparsers.add_parser('daemon', help="Processus résident gardant les modèles en mémoire")
+    daemon_parser.add_argument('--spool', default=Config.SPOOL_DIR, help="Répertoire des travaux")
+    daemon_parser.add_argument('--poll', type=float, default=Config.DAEMON_POLL_INTERVAL,
+                               help="Secondes entre deux scrutations")
+    daemon_parser.add_argument('--no-warm', action='store_true',
+                               help="Ne pas charger les modèles avant le premier travail")
+    add_summary_arguments(daemon_parser)
+    add_metrics_arguments(daemon_parser)
+    add_output_arguments(daemon_parser)
+
+    submit_parser = subparsers.add_parser('submit', help="Dépose un travail pour le démon")
+    submit_parser.add_argument('opml', help="Fichier OPML à traiter")
+    submit_parser.add_argument('--spool', default=Config.SPOOL_DIR, help="Répertoire des travaux")
+    submit_parser.add_argument('-c', '--category', action='append', dest='categories',
+                               help="Catégorie à traiter (option répétable)")
+    submit_parser.add_argument('--pipeline', action='store_true', default=Config.PIPELINE_MODE)
+    submit_parser.add_argument('--profile-run', metavar='FICHIER', help="Profile ce travail")
+    add_budget_arguments(submit_parser)
+
+    rebuild_parser = subparsers.add_parser('rebuild', help="Réécrit les revues à partir des articles conservés")
+    rebuild_parser.add_argument('--run', dest='run_id', help="Exécution à reconstruire (la dernière par défaut)")
+    rebuild_parser.add_argument('-c', '--category', action='append', dest='categories',
+                                help="Catégorie à reconstruire (option répétable)")
+    add_output_arguments(rebuild_parser)
+
+    bench_parser = subparsers.add_parser('bench-summarizer', help="Compare les profils de résumé")
+    bench_parser.add_argument('--profiles', nargs='+', default=list(Config.SUMMARY_PROFILES),
+                              choices=list(Config.SUMMARY_PROFILES))
+    bench_parser.add_argument('--baseline', default=Config.DEFAULT_SUMMARY_PROFILE,
+                              choices=list(Config.SUMMARY_PROFILES))
+    bench_parser.add_argument('--articles', default=Config.SUMMARY_BENCHMARK_FILE,
+                              help="Fichier JSON d'articles de référence")
+    bench_parser.add_argument('--output', help="Rapport JSON à écrire")
+    return parser
+
+def add_summary_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--inference-processes', type=int, default=Config.INFERENCE_PROCESSES,
+                        help="Processus d'inférence partageant les modèles (0 : threads)")
+    parser.add_argument('--summary-profile', default=Config.DEFAULT_SUMMARY_PROFILE,
+                        choices=list(Config.SUMMARY_PROFILES), help="Profil de résumé par défaut")
+    parser.add_argument('--category-profile', action='append', default=[], metavar='CATÉGORIE=PROFIL',
+                        help="Profil de résumé pour une catégorie (option répétable)")
+    parser.add_argument('--translate-first', action='store_true', default=not Config.SUMMARIZE_FIRST,
+                        help="Traduit le texte complet avant le résumé, quelle que soit la langue")
+    parser.add_argument('--no-dedup', action='store_true', default=not Config.DEDUP_ENABLED,
+                        help="Traite chaque reprise d'une même dépêche séparément")
+    parser.add_argument('--include-seen', action='store_true', default=not Config.DEDUP_SKIP_SEEN,
+                        help="Conserve les articles déjà couverts par une revue précédente")
+    parser.add_argument('--incremental', action='store_true', default=Config.INCREMENTAL,
+                        help="Ne traite et ne publie que les articles absents du stockage")
+    parser.add_argument('--recompute', action='store_true', default=not Config.REUSE_RESULTS,
+                        help="Retraduit et résume à nouveau les articles déjà conservés")
+
+def add_metrics_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--metrics-json', metavar='FICHIER', help="Rapport d'exécution JSON")
+    parser.add_argument('--metrics-prom', metavar='FICHIER',
+                        help="Métriques au format textfile Prometheus (node_exporter)")
+
+def add_output_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--format', action='append', dest='formats', choices=list(DOCUMENT_WRITERS),
+                        help=f"Format des revues (option répétable, défaut : {', '.join(Config.OUTPUT_FORMATS)})")
+
+def add_budget_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--budget', type=float, metavar='SECONDES',
+                       help="Temps alloué à l'exécution, documents compris")
+    group.add_argument('--deadline', metavar='HH:MM',
+                       help="Heure à laquelle la revue doit être prête")
+
+def run_budget_from_args(args: argparse.Namespace) -> Optional[float]:
+    if args.deadline:
+        return seconds_until(args.deadline)
+    return args.budget if args.budget is not None else Config.RUN_BUDGET
+
+def export_metrics(json_file: Optional[str], prom_file: Optional[str]):
+    if json_file:
+        METRICS.write_json(json_file)
+    if prom_file:
+        METRICS.write_prometheus(prom_file)
+
+def parse_category_profiles(values: List[str]) -> Dict[str, str]:
+    category_profiles = {}
+    for value in values:
+        category, _, profile = value.rpartition('=')
+        if not category or profile not in Config.SUMMARY_PROFILES:
+            raise argparse.ArgumentTypeError(f"Profil de catégorie invalide : {value}")
+        category_profiles[category] = profile
+    return category_profiles
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command in (None, 'gui'):
+        run_gui()
+    elif args.command == 'run':
+        processor = RSSProcessor(
+            args.summary_profile,
+            parse_category_profiles(args.category_profile),
+            args.inference_processes,
+            summarize_first=not args.translate_first,
+            dedup=not args.no_dedup,
+            skip_seen=not args.include_seen,
+            reuse_results=not args.recompute,
+            incremental=args.incremental,
+            output_formats=args.formats
+        )
+        try:
+            with run_profiler(args.profile_run):
+                processor.process_opml(args.opml, pipelined=args.pipeline, categories_filter=args.categories,
+                                       run_budget=run_budget_from_args(args))
+            export_metrics(args.metrics_json, args.metrics_prom)
+        finally:
+            processor.close()
+    elif args.command == 'daemon':
+        processor = RSSProcessor(
+            args.summary_profile,
+            parse_category_profiles(args.category_profile),
+            args.inference_processes,
+            summarize_first=not args.translate_first,
+            dedup=not args.no_dedup,
+            skip_seen=not args.include_seen,
+            reuse_results=not args.recompute,
+            incremental=args.incremental,
+            output_formats=args.formats
+        )
+        daemon = SpoolDaemon(args.spool, args.poll, processor)
+        daemon.metrics_json = args.metrics_json
+        daemon.metrics_prom = args.metrics_prom
+        daemon.serve_forever(warm=not args.no_warm)
+    elif args.command == 'submit':
+        job_file = SpoolDaemon.submit(args.spool, args.opml, args.categories, args.pipeline, args.profile_run,
+                                      run_budget_from_args(args))
+        print(f"Travail déposé : {job_file}")
+    elif args.command == 'rebuild':
+        processor = RSSProcessor(output_formats=args.formats)
+        try:
+            processor.rebuild_documents(args.run_id, args.categories)
+        finally:
+            processor.close()
+    elif args.command == 'bench-summarizer':
+        with open(args.articles, 'r', encoding='utf-8') as f:
+            articles = [article['text'] for article in json.load(f)]
+        reports = benchmark_summarizer_profiles(args.profiles, articles, args.baseline)
+        print_summarizer_benchmark(reports)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(reports, f, ensure_ascii=False, indent=2)
+    return 0
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())